@@ -1,58 +1,197 @@
+import errno
 import os
-from utils.hash import file_hash
-from storage.local_store import save_undo_history
+import shutil
+import threading
+from utils.hash import file_hash, quick_signature, QUICK_SAMPLE
+from storage.local_store import save_undo_history, save_undo_history_bulk
 
 
-def is_duplicate(src, dst_folder):
+def is_duplicate(src, dst_folder, dst_path=None):
     """
     Check if file already exists in destination folder
-    
+
+    Content comparison uses a fast non-cryptographic hash (see
+    utils.hash) — this is an equality check, not a security check.
+
     Args:
         src: Source file path
         dst_folder: Destination folder path
-        
+        dst_path: Prebuilt destination file path (skips the join when the
+                  caller already computed it)
+
     Returns:
         tuple: (bool, str or None) - (is_duplicate, existing_file_path)
     """
-    filename = os.path.basename(src)
-    dst_path = os.path.join(dst_folder, filename)
-    
-    # 1. Exact filename exists?
-    if not os.path.exists(dst_path):
+    if dst_path is None:
+        dst_path = os.path.join(dst_folder, os.path.basename(src))
+
+    # 1. Exact filename exists? (one stat doubles as the existence check)
+    try:
+        dst_size = os.stat(dst_path).st_size
+    except OSError:
         return False, None
-    
-    # 2. If yes — check content similarity
-    # Compare file hashes
+
+    # 2. Cheap identity check: different sizes can't be the same content.
+    # A vanished source isn't a duplicate - let the move itself report it
+    try:
+        if os.stat(src).st_size != dst_size:
+            return False, dst_path
+    except OSError:
+        return False, dst_path
+
+    # 3. Same size — compare head/tail signatures (reads at most 128 KiB
+    # per file). Differing signatures rule out a duplicate without ever
+    # touching the middle of the files.
+    try:
+        src_sig = quick_signature(src)
+        dst_sig = quick_signature(dst_path)
+    except OSError:
+        return False, dst_path
+
+    if src_sig != dst_sig:
+        return False, dst_path
+
+    # Small files are fully covered by the head sample, so a matching
+    # signature already proves equal content
+    if dst_size <= QUICK_SAMPLE:
+        return True, dst_path
+
+    # 4. Signature collision on a larger file — full content hash decides
     return file_hash(src) == file_hash(dst_path), dst_path
 
+
 def move_file(src, folder):
     """
     Move file to destination folder
-    
+
     Returns:
         tuple: (success: bool, error_type: str or None)
         error_types: 'locked', 'duplicate', 'other'
     """
+    # Compute names/paths once and reuse them everywhere below
+    name = os.path.basename(src)
+    folder = os.path.normpath(folder)
+    dst = os.path.join(folder, name)
+
     # Check for duplicates before moving
-    is_dup, existing_path = is_duplicate(src, folder)
+    is_dup, existing_path = is_duplicate(src, folder, dst_path=dst)
     if is_dup:
         print(f"⚠️  Duplicate detected! File already exists: {existing_path}")
         print(f"Skipping move.")
         return False, 'duplicate'
-    
-    # Normalize paths to use consistent separators
-    folder = os.path.normpath(folder)
+
     os.makedirs(folder, exist_ok=True)
-    dst = os.path.join(folder, os.path.basename(src))
-    
+
     try:
-        os.rename(src, dst)
+        # Same-filesystem rename is a single atomic syscall; only fall
+        # back to shutil.move (copy + delete) for cross-device moves
+        try:
+            os.rename(src, dst)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(src, dst)
         save_undo_history(src, dst)
         print(f"✓ Moved to {dst}")
         return True, None
     except PermissionError:
-        print(f"⚠️  File locked - '{os.path.basename(src)}' is open in another program")
+        print(f"⚠️  File locked - '{name}' is open in another program")
         return False, 'locked'
     except Exception as e:
         print(f"⚠️  Error moving file: {e}")
         return False, 'other'
+
+
+def move_files(moves):
+    """
+    Move several files, amortizing per-move bookkeeping
+
+    Same-filesystem renames are already one syscall each (a batched
+    io_uring submission isn't reachable from pure Python), so the
+    amortizable costs are elsewhere: each destination folder is created
+    at most once per batch, and all successful moves land in the undo
+    history in a single transaction instead of one commit per file.
+
+    Args:
+        moves: Iterable of (src, folder) pairs
+
+    Returns:
+        dict: {src: (success, error_type)} with the same error types
+        as move_file
+    """
+    results = {}
+    made_dirs = set()
+    moved = []
+
+    for src, folder in moves:
+        name = os.path.basename(src)
+        folder = os.path.normpath(folder)
+        dst = os.path.join(folder, name)
+
+        is_dup, existing_path = is_duplicate(src, folder, dst_path=dst)
+        if is_dup:
+            print(f"⚠️  Duplicate detected! File already exists: {existing_path}")
+            print(f"Skipping move.")
+            results[src] = (False, 'duplicate')
+            continue
+
+        if folder not in made_dirs:
+            os.makedirs(folder, exist_ok=True)
+            made_dirs.add(folder)
+
+        try:
+            try:
+                os.rename(src, dst)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(src, dst)
+            moved.append((src, dst))
+            print(f"✓ Moved to {dst}")
+            results[src] = (True, None)
+        except PermissionError:
+            print(f"⚠️  File locked - '{name}' is open in another program")
+            results[src] = (False, 'locked')
+        except Exception as e:
+            print(f"⚠️  Error moving file: {e}")
+            results[src] = (False, 'other')
+
+    save_undo_history_bulk(moved)
+    return results
+
+
+class MoveDispatcher:
+    """
+    Serialize concurrent moves per destination device
+
+    When moves run from multiple threads (e.g. a parallel batch runner),
+    several files landing on the same physical drive cause seek thrash on
+    HDDs and queue-depth contention on SSDs. Moves targeting the same
+    st_dev are serialized behind one lock; moves to different devices
+    still proceed in parallel.
+
+    Single-threaded callers can keep using move_file directly.
+    """
+
+    def __init__(self):
+        self._guard = threading.Lock()
+        self._device_locks = {}  # st_dev -> threading.Lock
+
+    def move(self, src, folder):
+        """Thread-safe move_file wrapper, serialized per destination device"""
+        folder = os.path.normpath(folder)
+        os.makedirs(folder, exist_ok=True)
+        try:
+            dev = os.stat(folder).st_dev
+        except OSError:
+            dev = None
+
+        with self._guard:
+            lock = self._device_locks.setdefault(dev, threading.Lock())
+
+        with lock:
+            return move_file(src, folder)
+
+
+# Shared dispatcher for callers that move files concurrently
+move_dispatcher = MoveDispatcher()
@@ -5,10 +5,10 @@ Undo functionality for file moves
 Allows users to revert recent file moves and provides feedback
 to the learning system that the suggestion was wrong.
 """
+import errno
 import os
 import shutil
-from storage.local_store import get_undo_history
-import sqlite3
+from storage.local_store import get_undo_history, get_connection, invalidate_decision
 
 
 def show_undo_history(limit=10):
@@ -32,10 +32,10 @@ def show_undo_history(limit=10):
     print(f"{'='*60}")
 
     for i, entry in enumerate(history, 1):
-        filename = entry['file']
-        from_folder = os.path.basename(os.path.dirname(entry['from']))
-        to_folder = os.path.basename(os.path.dirname(entry['to']))
-        timestamp = entry['timestamp'].split('T')[0]  # Just date
+        filename = entry.file
+        from_folder = os.path.basename(os.path.dirname(entry.src))
+        to_folder = os.path.basename(os.path.dirname(entry.dst))
+        timestamp = entry.timestamp.split('T')[0]  # Just date
 
         print(f"{i}. {filename}")
         print(f"   {from_folder} → {to_folder}")
@@ -55,7 +55,7 @@ def undo_move(move_id=None):
     Returns:
         bool: Success status
     """
-    conn = sqlite3.connect("storage/state.db")
+    conn = get_connection()
     c = conn.cursor()
 
     if move_id is None:
@@ -77,7 +77,6 @@ def undo_move(move_id=None):
     row = c.fetchone()
 
     if not row:
-        conn.close()
         print("❌ No move found to undo")
         return False
 
@@ -86,35 +85,40 @@ def undo_move(move_id=None):
     # Check if destination file still exists
     if not os.path.exists(dst):
         print(f"❌ Cannot undo: File no longer at {dst}")
-        conn.close()
         return False
 
     # Check if source location is available
     if os.path.exists(src):
         print(f"❌ Cannot undo: A file already exists at {src}")
-        conn.close()
         return False
 
     try:
-        # Move file back to original location
-        shutil.move(dst, src)
-
-        # Remove from undo history
-        c.execute("DELETE FROM undo_history WHERE id = ?", (move_id,))
-
-        # Remove from decisions (so it doesn't get auto-moved again)
-        c.execute("DELETE FROM decisions WHERE filename = ?", (filename,))
-
-        # Add negative learning signal (this move was wrong)
-        # Get the folder that was suggested
-        suggested_folder = os.path.dirname(dst)
-        c.execute("""
-            INSERT INTO learning (filename, suggested_folder, action, timestamp)
-            VALUES (?, ?, 'choose', datetime('now'))
-        """, (filename, suggested_folder))
-
-        conn.commit()
-        conn.close()
+        # Move file back to original location - atomic rename on the same
+        # filesystem, copy+delete only when crossing devices (shutil's
+        # copy path uses kernel fast-copy syscalls where available)
+        try:
+            os.rename(dst, src)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
+            shutil.move(dst, src)
+
+        # All three bookkeeping writes go in one transaction
+        with conn:
+            # Remove from undo history
+            conn.execute("DELETE FROM undo_history WHERE id = ?", (move_id,))
+
+            # Remove from decisions (so it doesn't get auto-moved again)
+            conn.execute("DELETE FROM decisions WHERE filename = ?", (filename,))
+            invalidate_decision(filename)
+
+            # Add negative learning signal (this move was wrong)
+            # Get the folder that was suggested
+            suggested_folder = os.path.dirname(dst)
+            conn.execute("""
+                INSERT INTO learning (filename, suggested_folder, action, timestamp)
+                VALUES (?, ?, 'choose', datetime('now'))
+            """, (filename, suggested_folder))
 
         print(f"✓ Undone: {filename}")
         print(f"  Moved back from {os.path.basename(os.path.dirname(dst))} → {os.path.basename(os.path.dirname(src))}")
@@ -122,7 +126,6 @@ def undo_move(move_id=None):
         return True
 
     except Exception as e:
-        conn.close()
         print(f"❌ Error undoing move: {e}")
         return False
 
@@ -149,28 +152,8 @@ def undo_interactive():
 
         idx = int(choice) - 1
         if 0 <= idx < len(history):
-            # Get the move ID from history
-            # We need to query the DB to get the actual ID
-            entry = history[idx]
-            filename = entry['file']
-            dst = entry['to']
-
-            conn = sqlite3.connect("storage/state.db")
-            c = conn.cursor()
-            c.execute("""
-                SELECT id FROM undo_history
-                WHERE filename = ? AND dst = ?
-                ORDER BY id DESC
-                LIMIT 1
-            """, (filename, dst))
-            row = c.fetchone()
-            conn.close()
-
-            if row:
-                move_id = row[0]
-                undo_move(move_id)
-            else:
-                print("❌ Move not found in database")
+            # History entries already carry the DB id - no second query
+            undo_move(history[idx].id)
         else:
             print("❌ Invalid choice")
 
@@ -5,6 +5,7 @@ Batch manager with two-window system:
 - Window B: Batch (8 sec) - grouping related downloads
 """
 import time
+from collections import deque
 
 
 class BatchManager:
@@ -26,30 +27,33 @@ class BatchManager:
             window_seconds: Batch grouping window (default 8 sec - empirically optimal)
         """
         self.window = window_seconds
-        self.files = []
-        self.t_last = None  # Time last file was added
+        self.files = deque()
+        # Absolute deadline for closing the batch, on the monotonic clock
+        # (immune to NTP/DST jumps that would stretch or collapse the
+        # window). Precomputed on add so is_ready is one comparison.
+        self.next_ready_at = None
 
     def add_file(self, file_path):
-        """Rule 1: Add file to batch and update timestamp"""
+        """Rule 1: Add file to batch and push the close deadline out"""
         self.files.append(file_path)
-        self.t_last = time.time()
+        self.next_ready_at = time.monotonic() + self.window
+
+    def add_files(self, file_paths):
+        """Add several files that became ready together (one deadline push)"""
+        self.files.extend(file_paths)
+        self.next_ready_at = time.monotonic() + self.window
 
     def is_ready(self):
         """Rule 2: Check if batch should close"""
-        if not self.files or not self.t_last:
-            return False
-        
-        t_now = time.time()
-        elapsed = t_now - self.t_last
-        
-        # Batch closes when window elapsed
-        return elapsed >= self.window
+        # Polled every watcher tick - a single clock read and comparison
+        return self.next_ready_at is not None and time.monotonic() >= self.next_ready_at
 
     def pop_batch(self):
         """Extract batch and reset state"""
-        batch = self.files[:]
-        self.files.clear()
-        self.t_last = None
+        # Swap-and-reset hands the whole deque to the caller without the
+        # copy + clear pass (and its momentary double memory)
+        batch, self.files = self.files, deque()
+        self.next_ready_at = None
         return batch
     
     def is_single(self):
@@ -20,22 +20,65 @@ def compute_confidence(
     
     This is not ML — it's evidence aggregation.
     """
-    
+
     # If we have memory (past decision), trust it completely
     if memory_score > 0:
         return memory_score
-    
+
+    return compute_confidence_no_memory(
+        token_score, fuzzy_score, content_score, file_type_weight
+    )
+
+
+def compute_confidence_no_memory(token_score, fuzzy_score, content_score,
+                                 file_type_weight):
+    """
+    compute_confidence specialized for the no-memory case
+
+    Callers that already know there is no past decision (the matcher
+    checks memory before scoring any candidate) can skip the memory
+    branch entirely.
+    """
     # Combine scores with weights
     combined = (
         0.4 * token_score +
         0.3 * fuzzy_score +
         0.3 * content_score
     )
-    
+
     # Obvious-match boost: very high fuzzy + good token overlap
     if fuzzy_score >= 0.9 and token_score >= 0.5:
         combined = max(combined, 0.75)
-    
+
     # Soften file-type penalty so good matches don't get crushed
     type_factor = 0.7 + 0.3 * file_type_weight
     return min(combined * type_factor, 1.0)
+
+
+def compute_confidence_batch(memory_scores, token_scores, fuzzy_scores,
+                             content_scores, file_type_weights):
+    """
+    Batch form of compute_confidence over parallel score sequences
+    (structure-of-arrays layout)
+
+    Scoring many candidates one call at a time pays Python call overhead
+    per candidate; this computes all of them in one pass with the same
+    semantics as the scalar function.
+
+    Returns a list of confidences in [0, 1].
+    """
+    out = []
+    append = out.append
+
+    for m, t, f, c, w in zip(memory_scores, token_scores, fuzzy_scores,
+                             content_scores, file_type_weights):
+        if m > 0:
+            append(m)
+            continue
+
+        combined = 0.4 * t + 0.3 * f + 0.3 * c
+        if f >= 0.9 and t >= 0.5 and combined < 0.75:
+            combined = 0.75
+        append(min(combined * (0.7 + 0.3 * w), 1.0))
+
+    return out
@@ -21,3 +21,17 @@ def decide_action(confidence, auto_th=0.85, suggest_th=0.4):
     else:
         return "ignore"
 
+
+def build_decision_lut(auto_th=0.85, suggest_th=0.4):
+    """
+    Precompute decide_action for every whole confidence percent
+
+    The thresholds are fixed at startup, so batch loops can decide with
+    a single list index - lut[int(confidence * 100)] - instead of two
+    float comparisons per file.
+
+    Returns:
+        list: 101 entries mapping percent (0-100) to an action string
+    """
+    return [decide_action(pct / 100, auto_th, suggest_th) for pct in range(101)]
+
@@ -1,93 +0,0 @@
-"""
-Learning system that improves decisions over time
-"""
-import json
-from pathlib import Path
-from datetime import datetime
-
-
-class LearningSystem:
-    """Learns from user corrections and feedback"""
-    
-    def __init__(self, store):
-        """
-        Initialize the learning system
-        
-        Args:
-            store: LocalStore instance for persistence
-        """
-        self.store = store
-        self.feedback_history = []
-    
-    def record_decision(self, file_path, decision, outcome):
-        """
-        Record a decision and its outcome
-        
-        Args:
-            file_path: Path to the file
-            decision: The decision that was made
-            outcome: The actual outcome (success/failure/corrected)
-        """
-        record = {
-            'timestamp': datetime.now().isoformat(),
-            'file_path': str(file_path),
-            'decision': decision,
-            'outcome': outcome
-        }
-        
-        self.feedback_history.append(record)
-        self.store.save_learning_record(record)
-    
-    def record_user_correction(self, file_path, suggested_path, actual_path):
-        """
-        Record when a user corrects an automatic decision
-        
-        Args:
-            file_path: Original file path
-            suggested_path: Path suggested by the system
-            actual_path: Path chosen by the user
-        """
-        correction = {
-            'timestamp': datetime.now().isoformat(),
-            'file_path': str(file_path),
-            'suggested_path': str(suggested_path),
-            'actual_path': str(actual_path)
-        }
-        
-        self.store.save_correction(correction)
-        print(f"Learned from correction: {file_path} -> {actual_path}")
-    
-    def get_patterns(self):
-        """
-        Analyze feedback history to find patterns
-        
-        Returns:
-            dict: Patterns learned from feedback
-        """
-        # TODO: Implement pattern analysis
-        # This could use ML to find patterns in user corrections
-        pass
-    
-    def improve_decision(self, features, base_decision):
-        """
-        Improve a decision based on learned patterns
-        
-        Args:
-            features: File features
-            base_decision: Initial decision from rule-based system
-            
-        Returns:
-            dict: Improved decision
-        """
-        # TODO: Implement decision improvement using learned patterns
-        return base_decision
-
-
-def decay_pattern(pattern_id, factor=0.6):
-    """
-    Reduce stored confidence/weight for a pattern after undo.
-    
-    This is a placeholder for future learning logic.
-    """
-    # TODO: Implement persistence for pattern confidence decay
-    pass
@@ -10,8 +10,10 @@ Key Principles:
 This module reads from the learning table and adjusts base confidence
 scores based on historical user feedback.
 """
-import sqlite3
 from collections import defaultdict
+from functools import lru_cache
+
+from storage.local_store import get_connection
 
 
 def get_learning_effect(action):
@@ -92,8 +94,7 @@ def get_learning_stats(filename, folder):
             'total': int         # Total interactions
         }
     """
-    conn = sqlite3.connect("storage/state.db")
-    c = conn.cursor()
+    c = get_connection().cursor()
 
     # Get all actions for this filename-folder pair
     c.execute("""
@@ -104,7 +105,6 @@ def get_learning_stats(filename, folder):
     """, (filename, folder))
 
     results = c.fetchall()
-    conn.close()
 
     stats = {
         'accepts': 0,
@@ -142,8 +142,7 @@ def get_folder_learning_pattern(folder):
             'ignore_rate': float      # % of times ignored
         }
     """
-    conn = sqlite3.connect("storage/state.db")
-    c = conn.cursor()
+    c = get_connection().cursor()
 
     c.execute("""
         SELECT action, COUNT(*)
@@ -152,14 +151,16 @@ def get_folder_learning_pattern(folder):
         GROUP BY action
     """, (folder,))
 
-    results = c.fetchall()
-    conn.close()
-
-    counts = defaultdict(int)
-    for action, count in results:
-        counts[action] = count
-
-    total = sum(counts.values())
+    # Single pass, no defaultdict allocation or second traversal
+    total = accepts = rejects = ignores = 0
+    for action, count in c.fetchall():
+        total += count
+        if action == 'accept':
+            accepts = count
+        elif action == 'choose':
+            rejects = count
+        elif action == 'ignore':
+            ignores = count
 
     if total == 0:
         return {
@@ -171,32 +172,149 @@ def get_folder_learning_pattern(folder):
 
     return {
         'total_suggestions': total,
-        'accept_rate': counts['accept'] / total,
-        'reject_rate': counts['choose'] / total,
-        'ignore_rate': counts['ignore'] / total
+        'accept_rate': accepts / total,
+        'reject_rate': rejects / total,
+        'ignore_rate': ignores / total
     }
 
 
-def apply_learning_adjustment(base_confidence, filename, folder):
+# Within a batch many files land in the same folder, so the same stats
+# and folder patterns are requested repeatedly. Memoized variants serve
+# repeats from memory; main.py clears them at batch boundaries and
+# after recording feedback so reads never go stale.
+_get_learning_stats_cached = lru_cache(maxsize=512)(get_learning_stats)
+_get_folder_learning_pattern_cached = lru_cache(maxsize=512)(get_folder_learning_pattern)
+
+
+# Folder suggestion totals, loaded with one GROUP BY on first use. Most
+# folders (especially early on) have fewer than the 5 samples reputation
+# needs, so this lets apply_folder_reputation_boost bail out without a
+# per-folder query.
+_folder_totals = None
+
+
+def _get_folder_totals():
+    global _folder_totals
+    if _folder_totals is None:
+        c = get_connection().cursor()
+        c.execute(
+            "SELECT suggested_folder, COUNT(*) FROM learning GROUP BY suggested_folder"
+        )
+        _folder_totals = dict(c.fetchall())
+    return _folder_totals
+
+
+def clear_learning_caches():
+    """Drop memoized learning stats (call after feedback is recorded)"""
+    global _folder_totals
+    _get_learning_stats_cached.cache_clear()
+    _get_folder_learning_pattern_cached.cache_clear()
+    _folder_totals = None
+
+
+def get_learning_stats_bulk(pairs):
     """
-    Apply learning-based adjustment to base confidence score
+    Get learning statistics for many (filename, folder) pairs at once
 
-    Rules:
-    1. If user has ACCEPTED this filename-folder pair before: +10% boost
-    2. If user has REJECTED (chose different) before: -40% decay
-    3. If user only IGNORED: no change (neutral)
-    4. Multiple accepts/rejects compound the effect (capped at ±50%)
+    One connection and one IN query (chunked under SQLite's 999
+    parameter limit) replaces a connect + GROUP BY per pair.
 
     Args:
-        base_confidence: Base confidence from matcher (0-1)
-        filename: The file being matched
-        folder: The folder being suggested
+        pairs: Iterable of (filename, folder) tuples
 
     Returns:
-        float: Adjusted confidence (0-1)
+        dict: {(filename, folder): stats dict as in get_learning_stats}
     """
-    stats = get_learning_stats(filename, folder)
+    pairs = list(dict.fromkeys(pairs))
+    stats_by_pair = {
+        pair: {'accepts': 0, 'rejects': 0, 'ignores': 0, 'total': 0}
+        for pair in pairs
+    }
+    if not pairs:
+        return stats_by_pair
+
+    c = get_connection().cursor()
+
+    # 2 bind params per pair, stay under SQLITE_MAX_VARIABLE_NUMBER=999
+    for start in range(0, len(pairs), 450):
+        chunk = pairs[start:start + 450]
+        placeholders = ", ".join("(?, ?)" for _ in chunk)
+        params = [v for pair in chunk for v in pair]
+        c.execute(f"""
+            SELECT filename, suggested_folder, action, COUNT(*)
+            FROM learning
+            WHERE (filename, suggested_folder) IN ({placeholders})
+            GROUP BY filename, suggested_folder, action
+        """, params)
+
+        for filename, folder, action, count in c.fetchall():
+            stats = stats_by_pair[(filename, folder)]
+            stats['total'] += count
+            if action == 'accept':
+                stats['accepts'] = count
+            elif action == 'choose':
+                stats['rejects'] = count
+            elif action == 'ignore':
+                stats['ignores'] = count
+
+    return stats_by_pair
+
+
+def get_folder_patterns_bulk(folders):
+    """
+    Get learning patterns for many folders with a single query
+
+    Args:
+        folders: Iterable of folder paths
 
+    Returns:
+        dict: {folder: pattern dict as in get_folder_learning_pattern}
+    """
+    folders = list(dict.fromkeys(folders))
+    empty = {
+        'total_suggestions': 0,
+        'accept_rate': 0.0,
+        'reject_rate': 0.0,
+        'ignore_rate': 0.0
+    }
+    patterns = {folder: dict(empty) for folder in folders}
+    if not folders:
+        return patterns
+
+    c = get_connection().cursor()
+
+    counts_by_folder = defaultdict(lambda: defaultdict(int))
+    for start in range(0, len(folders), 900):
+        chunk = folders[start:start + 900]
+        placeholders = ", ".join("?" for _ in chunk)
+        c.execute(f"""
+            SELECT suggested_folder, action, COUNT(*)
+            FROM learning
+            WHERE suggested_folder IN ({placeholders})
+            GROUP BY suggested_folder, action
+        """, chunk)
+        for folder, action, count in c.fetchall():
+            counts_by_folder[folder][action] = count
+
+    for folder, counts in counts_by_folder.items():
+        total = sum(counts.values())
+        if total:
+            patterns[folder] = {
+                'total_suggestions': total,
+                'accept_rate': counts['accept'] / total,
+                'reject_rate': counts['choose'] / total,
+                'ignore_rate': counts['ignore'] / total
+            }
+    return patterns
+
+
+def apply_learning_adjustment_from_stats(base_confidence, stats):
+    """
+    Pure adjustment math over already-fetched learning stats
+
+    Separated from the DB lookup so batch callers can fetch stats in
+    bulk and run the arithmetic without touching SQLite per file.
+    """
     # No learning history - return base confidence
     if stats['total'] == 0:
         return base_confidence
@@ -219,24 +337,90 @@ def apply_learning_adjustment(base_confidence, filename, folder):
     return max(0.0, min(1.0, adjusted))
 
 
-def apply_folder_reputation_boost(confidence, folder):
+def apply_learning_adjustment_bulk(base_confidences, stats_list):
     """
-    Apply small boost/penalty based on folder's overall reputation
+    Adjustment kernel over parallel lists
 
-    If a folder has historically high acceptance rate, give it a small boost.
-    If it has high rejection rate, apply a small penalty.
+    Structure-of-arrays form of apply_learning_adjustment_from_stats:
+    one Python-level loop with locals bound once, no per-element
+    function calls or DB access. (A NumPy/numba kernel would be the
+    next rung, but neither is a dependency of this prototype and the
+    arithmetic is already dwarfed by the I/O it was split from.)
 
-    This is a GENTLE effect (±5% max) to avoid overfitting.
+    Args:
+        base_confidences: list of base confidence floats
+        stats_list: list of stats dicts aligned with base_confidences
+
+    Returns:
+        list: adjusted confidences, clamped to [0, 1]
+    """
+    _min = min
+    _max = max
+    adjusted = []
+    append = adjusted.append
+    for base, stats in zip(base_confidences, stats_list):
+        if stats['total'] == 0:
+            append(base)
+            continue
+        adjustment = 0.0
+        accepts = stats['accepts']
+        if accepts > 0:
+            adjustment += _min(accepts * 0.10, 0.50)
+        rejects = stats['rejects']
+        if rejects > 0:
+            adjustment -= _min(rejects * 0.40, 0.50)
+        append(_max(0.0, _min(1.0, base + adjustment)))
+    return adjusted
+
+
+def apply_folder_reputation_boost_bulk(confidences, patterns):
+    """
+    Reputation kernel over parallel lists
 
     Args:
-        confidence: Current confidence score
+        confidences: list of confidence floats
+        patterns: list of folder pattern dicts aligned with confidences
+
+    Returns:
+        list: adjusted confidences, clamped to [0, 1]
+    """
+    _min = min
+    _max = max
+    adjusted = []
+    append = adjusted.append
+    for confidence, pattern in zip(confidences, patterns):
+        if pattern['total_suggestions'] < 5:
+            append(confidence)
+            continue
+        reputation = pattern['accept_rate'] - pattern['reject_rate']
+        append(_max(0.0, _min(1.0, confidence + reputation * 0.05)))
+    return adjusted
+
+
+def apply_learning_adjustment(base_confidence, filename, folder):
+    """
+    Apply learning-based adjustment to base confidence score
+
+    Rules:
+    1. If user has ACCEPTED this filename-folder pair before: +10% boost
+    2. If user has REJECTED (chose different) before: -40% decay
+    3. If user only IGNORED: no change (neutral)
+    4. Multiple accepts/rejects compound the effect (capped at ±50%)
+
+    Args:
+        base_confidence: Base confidence from matcher (0-1)
+        filename: The file being matched
         folder: The folder being suggested
 
     Returns:
-        float: Adjusted confidence with reputation factor
+        float: Adjusted confidence (0-1)
     """
-    pattern = get_folder_learning_pattern(folder)
+    stats = _get_learning_stats_cached(filename, folder)
+    return apply_learning_adjustment_from_stats(base_confidence, stats)
+
 
+def apply_folder_reputation_boost_from_pattern(confidence, pattern):
+    """Pure reputation math over an already-fetched folder pattern"""
     # Need at least 5 samples for reputation to matter
     if pattern['total_suggestions'] < 5:
         return confidence
@@ -253,6 +437,31 @@ def apply_folder_reputation_boost(confidence, folder):
     return max(0.0, min(1.0, adjusted))
 
 
+def apply_folder_reputation_boost(confidence, folder):
+    """
+    Apply small boost/penalty based on folder's overall reputation
+
+    If a folder has historically high acceptance rate, give it a small boost.
+    If it has high rejection rate, apply a small penalty.
+
+    This is a GENTLE effect (±5% max) to avoid overfitting.
+
+    Args:
+        confidence: Current confidence score
+        folder: The folder being suggested
+
+    Returns:
+        float: Adjusted confidence with reputation factor
+    """
+    # Cheap short-circuit: folders without enough history can't get a
+    # reputation adjustment, so skip the pattern query entirely
+    if _get_folder_totals().get(folder, 0) < 5:
+        return confidence
+
+    pattern = _get_folder_learning_pattern_cached(folder)
+    return apply_folder_reputation_boost_from_pattern(confidence, pattern)
+
+
 def get_confidence_with_learning(base_confidence, filename, folder):
     """
     Main function: Get final confidence score with learning applied
@@ -279,6 +488,37 @@ def get_confidence_with_learning(base_confidence, filename, folder):
     return confidence
 
 
+def get_confidence_with_learning_bulk(items):
+    """
+    Batch counterpart of get_confidence_with_learning
+
+    Fetches learning stats and folder patterns for all items with the
+    two bulk queries, then runs the batch kernels - two SQLite round
+    trips per batch instead of two per file.
+
+    Args:
+        items: list of (base_confidence, filename, folder) tuples
+
+    Returns:
+        list: final confidences aligned with items
+    """
+    if not items:
+        return []
+
+    pairs = [(filename, folder) for _, filename, folder in items]
+    stats_by_pair = get_learning_stats_bulk(pairs)
+    patterns_by_folder = get_folder_patterns_bulk(
+        [folder for _, _, folder in items]
+    )
+
+    bases = [base for base, _, _ in items]
+    stats_list = [stats_by_pair[pair] for pair in pairs]
+    adjusted = apply_learning_adjustment_bulk(bases, stats_list)
+
+    patterns = [patterns_by_folder[folder] for _, _, folder in items]
+    return apply_folder_reputation_boost_bulk(adjusted, patterns)
+
+
 def get_learning_insights(limit=10):
     """
     Get insights from learning data for analytics
@@ -290,41 +530,27 @@ def get_learning_insights(limit=10):
             'recent_feedback': [(filename, folder, action, timestamp)]
         }
     """
-    conn = sqlite3.connect("storage/state.db")
-    c = conn.cursor()
-
-    # Get all folders with learning data
-    c.execute("""
-        SELECT suggested_folder, action, COUNT(*) as cnt
+    c = get_connection().cursor()
+
+    # Rates, the min-3-samples filter, ordering and the limit all run
+    # inside SQLite - only the requested top rows reach Python
+    _rates_query = """
+        SELECT suggested_folder,
+               SUM(CASE WHEN action = 'accept' THEN 1 ELSE 0 END) * 1.0 / COUNT(*) AS accept_rate,
+               SUM(CASE WHEN action = 'choose' THEN 1 ELSE 0 END) * 1.0 / COUNT(*) AS reject_rate,
+               COUNT(*) AS total
         FROM learning
-        GROUP BY suggested_folder, action
-    """)
-
-    folder_stats = defaultdict(lambda: {'accept': 0, 'choose': 0, 'ignore': 0})
-    for folder, action, count in c.fetchall():
-        folder_stats[folder][action] = count
-
-    # Calculate rates
-    folder_rates = []
-    for folder, stats in folder_stats.items():
-        total = sum(stats.values())
-        accept_rate = stats['accept'] / total if total > 0 else 0
-        reject_rate = stats['choose'] / total if total > 0 else 0
-        folder_rates.append((folder, accept_rate, reject_rate, total))
+        GROUP BY suggested_folder
+        HAVING COUNT(*) >= 3
+    """
 
     # Top folders (high accept rate, min 3 samples)
-    top_folders = sorted(
-        [(f, ar, t) for f, ar, rr, t in folder_rates if t >= 3],
-        key=lambda x: x[1],
-        reverse=True
-    )[:limit]
+    c.execute(_rates_query + " ORDER BY accept_rate DESC LIMIT ?", (limit,))
+    top_folders = [(f, ar, t) for f, ar, rr, t in c.fetchall()]
 
     # Problem folders (high reject rate, min 3 samples)
-    problem_folders = sorted(
-        [(f, rr, t) for f, ar, rr, t in folder_rates if t >= 3],
-        key=lambda x: x[1],
-        reverse=True
-    )[:limit]
+    c.execute(_rates_query + " ORDER BY reject_rate DESC LIMIT ?", (limit,))
+    problem_folders = [(f, rr, t) for f, ar, rr, t in c.fetchall()]
 
     # Recent feedback
     c.execute("""
@@ -335,7 +561,6 @@ def get_learning_insights(limit=10):
     """, (limit,))
 
     recent_feedback = c.fetchall()
-    conn.close()
 
     return {
         'top_folders': top_folders,
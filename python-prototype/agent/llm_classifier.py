@@ -4,20 +4,72 @@ LLM-based intelligent file classification using OpenAI
 import os
 import json
 import yaml
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from openai import OpenAI
-from features.content_extractors import extract_title, extract_image_text, is_image
+from features.cache import get_content
+from storage.local_store import get_cached_classification, save_cached_classification
+from utils.hash import file_hash, file_hashes
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
+SETTINGS_PATH = "config/settings.yaml"
 
-def load_settings():
-    """Load settings from config/settings.yaml"""
-    with open("config/settings.yaml", "r") as f:
+
+@lru_cache(maxsize=None)
+def _load_settings(mtime_ns):
+    # mtime_ns keys the cache so edits to the file invalidate it
+    with open(SETTINGS_PATH, "r") as f:
         return yaml.safe_load(f)
 
 
+def load_settings():
+    """Load settings from config/settings.yaml (cached until the file changes)"""
+    return _load_settings(os.stat(SETTINGS_PATH).st_mtime_ns)
+
+
+# Single shared client - constructing one per call would redo DNS, TLS
+# and connection-pool setup for every classification
+_client = None
+_client_key = None
+
+
+def _get_client(api_key):
+    """Get the shared OpenAI client, rebuilding only if the key changed"""
+    global _client, _client_key
+    if _client is None or _client_key != api_key:
+        _client = OpenAI(api_key=api_key)
+        _client_key = api_key
+    return _client
+
+
+def llm_available():
+    """
+    True if LLM classification is enabled and an API key is configured
+
+    Same test the classify functions make before calling out; batch
+    callers check it up front so a disabled LLM doesn't trigger the
+    content prefetch (OCR, title extraction) that only exists to feed
+    the prompt.
+    """
+    try:
+        ai_config = load_settings().get("ai", {})
+    except OSError:
+        return False
+    if not ai_config.get("enabled", True):
+        return False
+    api_key = os.getenv("OPENAI_API_KEY") or ai_config.get("openai_api_key")
+    return bool(api_key) and api_key != "YOUR_OPENAI_API_KEY_HERE"
+
+
+@lru_cache(maxsize=32)
+def _folder_block(folder_names):
+    """Join folder names into a prompt block once per folder set"""
+    return "\n".join(f"- {name}" for name in folder_names)
+
+
 def get_file_content_summary(file_path, max_chars=500):
     """
     Extract a summary of file content for LLM analysis
@@ -30,10 +82,7 @@ def get_file_content_summary(file_path, max_chars=500):
         str: Content summary or empty string
     """
     try:
-        if is_image(file_path):
-            content = extract_image_text(file_path)
-        else:
-            content = extract_title(file_path)
+        content = get_content(file_path)
 
         if content:
             # Truncate to reasonable length for LLM
@@ -76,8 +125,8 @@ def llm_classify(file_path, available_folders):
             print("[WARN] OpenAI API key not found. Set OPENAI_API_KEY env var or update config/settings.yaml")
             return None
 
-        # Initialize OpenAI client
-        client = OpenAI(api_key=api_key)
+        # Reuse the shared OpenAI client (keeps the HTTP connection warm)
+        client = _get_client(api_key)
 
         # Extract file information
         filename = os.path.basename(file_path)
@@ -85,55 +134,51 @@ def llm_classify(file_path, available_folders):
 
         # Prepare folder list (extract just folder names for cleaner prompt)
         folder_names = [os.path.basename(folder) for folder in available_folders]
+        folder_block = _folder_block(tuple(folder_names))
 
-        # Build prompt
-        prompt = f"""You are a file organization assistant for an Imperial College student.
-
-Analyze this file and determine which folder it belongs to.
+        # Tight prompt - the JSON shape and folder choices are enforced by
+        # the response schema, so no formatting instructions needed
+        prompt = f"""Classify this file for an Imperial College student into one of the available folders.
 
 Filename: {filename}
 Content summary: {content_summary if content_summary else "No extractable content"}
 
 Available folders:
-{chr(10).join(f"- {name}" for name in folder_names)}
-
-Which folder best fits this file? Consider:
-- Academic subject matter (e.g., Integer Programming → Operations Research)
-- Course names and topics
-- File content and context
-
-Respond ONLY with valid JSON in this exact format:
-{{
-  "folder": "folder_name_here",
-  "confidence": 85,
-  "reasoning": "Brief explanation"
-}}
-
-Rules:
-- confidence must be 0-100 (integer)
-- folder must exactly match one of the available folders
-- If no good match exists, use confidence < 40"""
-
-        # Call OpenAI API
+{folder_block}
+
+Consider course names, academic subject matter, and file content.
+If no folder fits well, use confidence < 40."""
+
+        # Call OpenAI API with structured output constrained to our schema
         response = client.chat.completions.create(
             model=ai_config.get("model", "gpt-4o-mini"),
             messages=[
-                {"role": "system", "content": "You are a precise file classification assistant. Always respond with valid JSON."},
+                {"role": "system", "content": "You are a precise file classification assistant."},
                 {"role": "user", "content": prompt}
             ],
             temperature=ai_config.get("temperature", 0.3),
-            max_tokens=ai_config.get("max_tokens", 200)
+            max_tokens=ai_config.get("max_tokens", 80),
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "classify_file",
+                    "strict": True,
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "folder": {"type": "string", "enum": folder_names},
+                            "confidence": {"type": "integer"},
+                            "reasoning": {"type": "string"},
+                        },
+                        "required": ["folder", "confidence", "reasoning"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
         )
 
-        # Parse response
+        # Structured output is guaranteed to be plain JSON
         response_text = response.choices[0].message.content.strip()
-
-        # Extract JSON from response (handle markdown code blocks)
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-
         result = json.loads(response_text)
 
         # Validate response
@@ -174,10 +219,136 @@ Rules:
         return None
 
 
+def _llm_classify_batch(file_paths, available_folders):
+    """
+    Classify several files in a single LLM request
+
+    One prompt listing every file amortizes the per-request network and
+    prompt overhead across the batch; the response schema enforces one
+    entry per file with folders constrained to the known set.
+
+    Returns:
+        dict: {file_path: result dict or None}, or None if the request
+        itself failed (caller decides how to fall back)
+    """
+    try:
+        settings = load_settings()
+        ai_config = settings.get("ai", {})
+
+        if not ai_config.get("enabled", True):
+            return None
+
+        api_key = os.getenv("OPENAI_API_KEY") or ai_config.get("openai_api_key")
+        if not api_key or api_key == "YOUR_OPENAI_API_KEY_HERE":
+            print("[WARN] OpenAI API key not found. Set OPENAI_API_KEY env var or update config/settings.yaml")
+            return None
+
+        client = _get_client(api_key)
+
+        folder_names = [os.path.basename(folder) for folder in available_folders]
+        folder_block = _folder_block(tuple(folder_names))
+
+        filenames = [os.path.basename(p) for p in file_paths]
+        file_lines = []
+        for path, filename in zip(file_paths, filenames):
+            summary = get_file_content_summary(path)
+            file_lines.append(
+                f"- {filename}: {summary if summary else 'No extractable content'}"
+            )
+
+        prompt = f"""Classify these files for an Imperial College student into the available folders.
+
+Files (name: content summary):
+{chr(10).join(file_lines)}
+
+Available folders:
+{folder_block}
+
+Consider course names, academic subject matter, and file content.
+If no folder fits a file well, use confidence < 40 for it.
+Return one entry per file."""
+
+        response = client.chat.completions.create(
+            model=ai_config.get("model", "gpt-4o-mini"),
+            messages=[
+                {"role": "system", "content": "You are a precise file classification assistant."},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=ai_config.get("temperature", 0.3),
+            max_tokens=ai_config.get("max_tokens", 80) * len(file_paths),
+            response_format={
+                "type": "json_schema",
+                "json_schema": {
+                    "name": "classify_files",
+                    "strict": True,
+                    "schema": {
+                        "type": "object",
+                        "properties": {
+                            "results": {
+                                "type": "array",
+                                "items": {
+                                    "type": "object",
+                                    "properties": {
+                                        "file": {"type": "string", "enum": filenames},
+                                        "folder": {"type": "string", "enum": folder_names},
+                                        "confidence": {"type": "integer"},
+                                        "reasoning": {"type": "string"},
+                                    },
+                                    "required": ["file", "folder", "confidence", "reasoning"],
+                                    "additionalProperties": False,
+                                },
+                            },
+                        },
+                        "required": ["results"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+        )
+
+        response_text = response.choices[0].message.content.strip()
+        entries = json.loads(response_text)["results"]
+
+        folder_by_name = {os.path.basename(f): f for f in available_folders}
+        path_by_name = dict(zip(filenames, file_paths))
+
+        results = {path: None for path in file_paths}
+        for entry in entries:
+            path = path_by_name.get(entry.get("file"))
+            matched_folder = folder_by_name.get(entry.get("folder"))
+            if not path or not matched_folder:
+                continue
+            confidence_pct = entry.get("confidence", 0)
+            reasoning = entry.get("reasoning", "No explanation provided")
+            print(f"[LLM] {entry['file']} -> {entry['folder']} ({confidence_pct}%)")
+            results[path] = {
+                "folder": matched_folder,
+                "confidence": confidence_pct / 100.0,
+                "reasoning": reasoning,
+                "method": "llm"
+            }
+        return results
+
+    except json.JSONDecodeError as e:
+        print(f"[ERROR] LLM returned invalid JSON: {e}")
+        return None
+    except Exception as e:
+        print(f"[ERROR] LLM batch classification failed: {e}")
+        return None
+
+
+# In-process cache on top of the persisted llm_cache table
+_classification_cache = {}
+
+
 def classify_file(file_path, available_folders):
     """
     Main classification function - tries LLM first, falls back to None
 
+    Results are memoized by (content hash, folder set), both in memory
+    and in storage/state.db, so re-downloaded or re-processed files with
+    identical content never pay a second LLM round trip.
+
     Args:
         file_path: Path to file
         available_folders: List of available folder paths
@@ -185,4 +356,123 @@ def classify_file(file_path, available_folders):
     Returns:
         dict or None: Classification result or None (triggers fallback in matcher)
     """
-    return llm_classify(file_path, available_folders)
+    try:
+        hash_key = file_hash(file_path)
+    except OSError:
+        # Can't read the file - classify without caching
+        return llm_classify(file_path, available_folders)
+
+    folders_key = "|".join(sorted(available_folders))
+    key = (hash_key, folders_key)
+
+    result = _classification_cache.get(key)
+    if result is None:
+        result = get_cached_classification(hash_key, folders_key)
+
+    if result is None:
+        result = llm_classify(file_path, available_folders)
+        if result:
+            save_cached_classification(
+                hash_key, folders_key,
+                result["folder"], result["confidence"], result.get("reasoning", "")
+            )
+
+    if result:
+        _classification_cache[key] = result
+
+    return result
+
+
+def classify_files(file_paths, available_folders, max_workers=4):
+    """
+    Classify several files concurrently
+
+    Each classification is dominated by LLM round-trip latency, so a
+    small thread pool overlaps the network waits instead of paying them
+    one after another. Results also land in the classification cache, so
+    this doubles as a prefetch for subsequent classify_file calls.
+
+    Args:
+        file_paths: List of file paths to classify
+        available_folders: List of available folder paths
+        max_workers: Maximum concurrent requests
+
+    Returns:
+        dict: {file_path: classification result or None}
+    """
+    if not file_paths:
+        return {}
+
+    if len(file_paths) == 1:
+        path = file_paths[0]
+        return {path: classify_file(path, available_folders)}
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(file_paths))) as pool:
+        results = pool.map(lambda p: classify_file(p, available_folders), file_paths)
+
+    return dict(zip(file_paths, results))
+
+
+def classify_files_batch(file_paths, available_folders):
+    """
+    Classify several files with a single LLM request
+
+    Cached files are answered locally; only the remainder goes into one
+    batched prompt. If the batched request fails, falls back to the
+    per-file concurrent path so behaviour degrades to classify_files.
+
+    Args:
+        file_paths: List of file paths to classify
+        available_folders: List of available folder paths
+
+    Returns:
+        dict: {file_path: classification result or None}
+    """
+    if not file_paths:
+        return {}
+
+    if len(file_paths) == 1:
+        path = file_paths[0]
+        return {path: classify_file(path, available_folders)}
+
+    folders_key = "|".join(sorted(available_folders))
+    results = {}
+    keys = {}
+    uncached = []
+
+    # Hash the whole batch in parallel before the cache lookups - the
+    # hashing threads release the GIL, so this overlaps the disk reads
+    digests = file_hashes(file_paths)
+
+    for path in file_paths:
+        hash_key = digests[path]
+        if hash_key is None:
+            uncached.append(path)
+            continue
+
+        key = (hash_key, folders_key)
+        keys[path] = key
+        cached = _classification_cache.get(key)
+        if cached is None:
+            cached = get_cached_classification(hash_key, folders_key)
+        if cached:
+            _classification_cache[key] = cached
+            results[path] = cached
+        else:
+            uncached.append(path)
+
+    if uncached:
+        batch = _llm_classify_batch(uncached, available_folders)
+        if batch is None:
+            batch = classify_files(uncached, available_folders)
+        for path, result in batch.items():
+            results[path] = result
+            key = keys.get(path)
+            if result and key:
+                _classification_cache[key] = result
+                save_cached_classification(
+                    key[0], folders_key,
+                    result["folder"], result["confidence"], result.get("reasoning", "")
+                )
+
+    return {path: results.get(path) for path in file_paths}
@@ -1,8 +1,18 @@
 import os
 import re
-import sqlite3
-from rapidfuzz import fuzz
-from features.content_extractors import extract_title, extract_image_text, is_image
+from functools import lru_cache
+from rapidfuzz import fuzz, process, utils as rf_utils
+from storage.local_store import get_decision
+from agent.confidence import compute_confidence_no_memory
+from features.cache import get_content
+
+# Tokenizer pattern, compiled once (operates on pre-lowercased text)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# When name-based (token/fuzzy) matching already scores at least this
+# high, OCR/title extraction cannot meaningfully improve the pick and
+# is skipped entirely - well-named files never pay for Tesseract
+_CONTENT_SKIP_THRESHOLD = 0.75
 
 # File-type priority weights
 FILE_TYPE_PRIORS = {
@@ -16,31 +26,70 @@ FILE_TYPE_PRIORS = {
 }
 
 
+def _tokenize_lc(text_lc):
+    """Extract alphanumeric tokens from already-lowercased text"""
+    return set(_TOKEN_RE.findall(text_lc))
+
+
 def tokenize(text):
     """Extract alphanumeric tokens from text"""
-    return set(re.findall(r"[a-zA-Z0-9]+", text.lower()))
+    return _tokenize_lc(text.lower())
 
 
-def token_overlap_score(filename, folder_name):
-    """Calculate token overlap between filename and folder name"""
-    file_tokens = tokenize(filename)
-    folder_tokens = tokenize(folder_name)
-    
+def _overlap_score(file_tokens, folder_tokens):
+    """Token-overlap score between pre-tokenized sets"""
     if not folder_tokens or not file_tokens:
         return 0.0
-    
-    overlap = file_tokens.intersection(folder_tokens)
-    union = file_tokens.union(folder_tokens)
-    jaccard = len(overlap) / len(union)
-    
+
+    # |A ∪ B| = |A| + |B| - |A ∩ B|, so only the intersection is built;
+    # probing from the smaller set hashes the fewest elements
+    if len(file_tokens) <= len(folder_tokens):
+        inter = sum(1 for t in file_tokens if t in folder_tokens)
+    else:
+        inter = sum(1 for t in folder_tokens if t in file_tokens)
+    jaccard = inter / (len(file_tokens) + len(folder_tokens) - inter)
+
     # Bonus when all folder tokens appear in filename (common exact-match signal)
-    coverage = len(overlap) / len(folder_tokens)
+    coverage = inter / len(folder_tokens)
     return max(jaccard, coverage)
 
 
+def token_overlap_score(filename, folder_name):
+    """Calculate token overlap between filename and folder name"""
+    return _overlap_score(tokenize(filename), tokenize(folder_name))
+
+
+# Below this rapidfuzz score a pair cannot influence the final pick
+# (0.3 * 0.7 weighting puts it under every action threshold), so the C
+# kernel is allowed to bail out early instead of finishing the distance
+_FUZZY_CUTOFF = 30
+
+
 def fuzzy_score(a, b):
     """Calculate fuzzy similarity score (0-1)"""
-    return fuzz.partial_ratio(a.lower(), b.lower()) / 100.0
+    # token_set_ratio handles reordered/subword folder names better than
+    # partial_ratio's alignment search and supports early-exit cutoffs;
+    # default_process splits on punctuation so file_name.ext tokenizes
+    return fuzz.token_set_ratio(a, b, processor=rf_utils.default_process) / 100.0
+
+
+def _batch_fuzzy(query_lc, choices_lc):
+    """
+    Fuzzy-score one query against all choices in a single rapidfuzz call
+
+    process.extract runs the comparison loop in C over the whole choice
+    list (process.cdist would do the same but requires NumPy). Pairs
+    under the cutoff are left at 0.0. Returns scores in [0, 1] indexed
+    like choices_lc.
+    """
+    scores = [0.0] * len(choices_lc)
+    for _, score, idx in process.extract(
+        query_lc, choices_lc, scorer=fuzz.token_set_ratio,
+        processor=rf_utils.default_process,
+        score_cutoff=_FUZZY_CUTOFF, limit=None
+    ):
+        scores[idx] = score / 100.0
+    return scores
 
 
 def combined_score(filename, folder):
@@ -50,16 +99,63 @@ def combined_score(filename, folder):
     return max(token_score, fuzzy * 0.7)
 
 
-def file_type_weight(file_path):
+def file_type_weight(file_path, _get=FILE_TYPE_PRIORS.get):
     """Get priority weight based on file extension"""
-    ext = os.path.splitext(file_path)[1].lower()
-    return FILE_TYPE_PRIORS.get(ext, 0.8)
+    # rpartition is cheaper than os.path.splitext's separator handling;
+    # anything that isn't a known extension falls to the default anyway
+    return _get('.' + file_path.rpartition('.')[2].lower(), 0.8)
+
+
+@lru_cache(maxsize=64)
+def _list_dirs(root_expanded, mtime_ns):
+    """
+    List a scope root's subfolders with precomputed name artifacts
+
+    Keyed on the root's mtime so unchanged directories cost a single
+    stat instead of a listdir + isdir per entry per incoming file.
+    Returns tuples of (folder_path, name, name_lower, token frozenset).
+    """
+    entries = []
+    # Local bindings skip the LOAD_GLOBAL/LOAD_ATTR per entry
+    _join = os.path.join
+    _isdir = os.path.isdir
+    for folder in os.listdir(root_expanded):
+        folder_path = _join(root_expanded, folder)
+        if _isdir(folder_path):
+            folder_lc = folder.lower()
+            entries.append(
+                (folder_path, folder, folder_lc, frozenset(_tokenize_lc(folder_lc)))
+            )
+    return tuple(entries)
+
+
+def _scope_folder_entries(scopes):
+    """Cached folder entries across all scope roots"""
+    entries = []
+    for scope in scopes:
+        root_expanded = os.path.expanduser(scope["root"])
+        try:
+            mtime_ns = os.stat(root_expanded).st_mtime_ns
+        except OSError:
+            continue
+        entries.extend(_list_dirs(root_expanded, mtime_ns))
+    return entries
 
 
-def match(file_path, scopes):
+def collect_available_folders(scopes):
+    """Collect candidate destination folders across all scope roots"""
+    return [entry[0] for entry in _scope_folder_entries(scopes)]
+
+
+def match(file_path, scopes, precomputed_llm_result=None, apply_learning=True):
     """
     Match file to best folder and return result with confidence
-    
+
+    precomputed_llm_result lets batch callers pass a classification
+    obtained via classify_files_batch so no second LLM call is made.
+    apply_learning=False returns the unadjusted confidence so batch
+    callers can apply learning in bulk afterwards.
+
     Returns:
         dict: {
             "folder": path or None,
@@ -71,20 +167,14 @@ def match(file_path, scopes):
             "file_type_weight": float
         }
     """
-    from agent.confidence import compute_confidence
-    
     filename = os.path.basename(file_path)
 
-    # 1. Check past decisions (memory)
-    conn = sqlite3.connect("storage/state.db")
-    c = conn.cursor()
-    c.execute("SELECT folder FROM decisions WHERE filename = ?", (filename,))
-    row = c.fetchone()
-    conn.close()
+    # 1. Check past decisions (memory) - cached lookup, no per-file connect
+    remembered = get_decision(filename)
 
-    if row:
+    if remembered:
         return {
-            "folder": row[0],
+            "folder": remembered,
             "confidence": 1.0,
             "memory_score": 1.0,
             "token_score": 0,
@@ -97,32 +187,29 @@ def match(file_path, scopes):
     # 2. Try LLM classification first
     from agent.llm_classifier import classify_file
 
-    # Collect all available folders
-    available_folders = []
-    for scope in scopes:
-        root = scope["root"]
-        root_expanded = os.path.expanduser(root)
-        if not os.path.exists(root_expanded):
-            continue
-        for folder in os.listdir(root_expanded):
-            folder_path = os.path.join(root_expanded, folder)
-            if os.path.isdir(folder_path):
-                available_folders.append(folder_path)
+    # Collect all available folders (cached listing with precomputed
+    # lowercase names and token sets, reused by the fallback below)
+    folder_entries = _scope_folder_entries(scopes)
+    available_folders = [entry[0] for entry in folder_entries]
 
-    # Try LLM classification
-    llm_result = classify_file(file_path, available_folders)
+    # Try LLM classification (batch callers may have it already)
+    llm_result = precomputed_llm_result
+    if llm_result is None:
+        llm_result = classify_file(file_path, available_folders)
 
     if llm_result and llm_result.get("confidence", 0) > 0:
         # LLM succeeded - apply learning adjustments
         llm_confidence = llm_result["confidence"]
         llm_folder = llm_result["folder"]
 
-        from agent.learning_logic import get_confidence_with_learning
-        final_confidence = get_confidence_with_learning(
-            llm_confidence,
-            filename,
-            llm_folder
-        )
+        final_confidence = llm_confidence
+        if apply_learning:
+            from agent.learning_logic import get_confidence_with_learning
+            final_confidence = get_confidence_with_learning(
+                llm_confidence,
+                filename,
+                llm_folder
+            )
 
         return {
             "folder": llm_folder,
@@ -142,44 +229,84 @@ def match(file_path, scopes):
     best_token = 0
     best_fuzzy = 0
     best_content = 0
+    ft_weight = file_type_weight(file_path)
 
-    for scope in scopes:
-        root = scope["root"]
-        root_expanded = os.path.expanduser(root)
-        if not os.path.exists(root_expanded):
-            continue
+    if folder_entries:
+        names_lc = [entry[2] for entry in folder_entries]
+
+        # Lowercase each string once; scorers and tokenizers below all
+        # take the pre-lowered form
+        fname_lc = filename.lower()
 
-        for folder in os.listdir(root_expanded):
-            folder_path = os.path.join(root_expanded, folder)
-            if not os.path.isdir(folder_path):
-                continue
-            
+        # Score the filename (and content, when present) against every
+        # folder in one vectorized rapidfuzz pass - the C kernel compares
+        # the whole batch instead of paying a Python call per folder
+        fuzzy_scores = _batch_fuzzy(fname_lc, names_lc)
+
+        # All file-derived artifacts are computed once, not per folder
+        file_tokens = _tokenize_lc(fname_lc)
+
+        # Inverted index token -> folder indices: only folders sharing at
+        # least one token get an overlap computation, the rest are known
+        # zeros without touching their token sets
+        folder_token_sets = [entry[3] for entry in folder_entries]
+        postings = {}
+        for f_idx, toks in enumerate(folder_token_sets):
+            for tok in toks:
+                postings.setdefault(tok, []).append(f_idx)
+
+        candidates = set()
+        for tok in file_tokens:
+            candidates.update(postings.get(tok, ()))
+
+        token_scores = [
+            _overlap_score(file_tokens, folder_token_sets[idx])
+            if idx in candidates else 0.0
+            for idx in range(len(folder_entries))
+        ]
+
+        # Cheap signals first: only pay for OCR/title extraction when no
+        # folder already matches well on the filename alone
+        best_cheap = max(
+            max(t, f * 0.7) for t, f in zip(token_scores, fuzzy_scores)
+        )
+
+        content = ""
+        content_fuzzy = None
+        content_tokens = None
+        content_candidates = set()
+        if best_cheap < _CONTENT_SKIP_THRESHOLD:
+            content = get_content(file_path)
+            if content:
+                content_lc = content.lower()
+                content_fuzzy = _batch_fuzzy(content_lc, names_lc)
+                content_tokens = _tokenize_lc(content_lc)
+                for tok in content_tokens:
+                    content_candidates.update(postings.get(tok, ()))
+
+        # Bind loop-invariant callables locally - per-iteration global
+        # lookups add up across N folders per file
+        _overlap = _overlap_score
+        _max = max
+
+        for idx, folder_path in enumerate(available_folders):
             # Calculate individual scores
-            token_sc = token_overlap_score(filename, folder)
-            fuzzy_sc = fuzzy_score(filename, folder)
-            
-            # Extract and score content if available
+            token_sc = token_scores[idx]
+            fuzzy_sc = fuzzy_scores[idx]
+
             content_sc = 0
-            
-            # Use OCR for images, title extraction for docs
-            if is_image(file_path):
-                content = extract_image_text(file_path)
-            else:
-                content = extract_title(file_path)
-            
             if content:
-                content_sc = max(
-                    token_overlap_score(content, folder),
-                    fuzzy_score(content, folder)
-                )
-            
+                content_sc = content_fuzzy[idx]
+                if idx in content_candidates:
+                    content_sc = _max(
+                        _overlap(content_tokens, folder_token_sets[idx]),
+                        content_sc
+                    )
+
             # Combined score
-            score = max(token_sc, fuzzy_sc * 0.7, content_sc)
-            
-            # Apply file-type weight
-            ft_weight = file_type_weight(file_path)
+            score = _max(token_sc, fuzzy_sc * 0.7, content_sc)
             weighted_score = score * ft_weight
-            
+
             if weighted_score > best_score:
                 best_score = weighted_score
                 best_folder = folder_path
@@ -187,10 +314,9 @@ def match(file_path, scopes):
                 best_fuzzy = fuzzy_sc
                 best_content = content_sc
 
-    # Compute base confidence
-    ft_weight = file_type_weight(file_path)
-    base_confidence = compute_confidence(
-        memory_score=0,
+    # Compute base confidence - memory was already ruled out above, so
+    # use the specialized no-memory variant
+    base_confidence = compute_confidence_no_memory(
         token_score=best_token,
         fuzzy_score=best_fuzzy,
         content_score=best_content,
@@ -199,7 +325,7 @@ def match(file_path, scopes):
 
     # Apply learning adjustments if we have a folder match
     final_confidence = base_confidence
-    if best_folder:
+    if best_folder and apply_learning:
         from agent.learning_logic import get_confidence_with_learning
         final_confidence = get_confidence_with_learning(
             base_confidence,
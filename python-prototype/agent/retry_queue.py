@@ -2,75 +2,99 @@
 """
 Retry queue for locked files with exponential backoff
 """
+import heapq
+import os
 import time
 
 
 class LockedFileQueue:
     """
     Manages locked files with retry logic
-    
+
     Features:
     - Exponential backoff (5s, 10s, 20s, 40s, 60s max)
     - Max 5 retry attempts
     - Tracks last retry time
+    - Heap of next-eligible timestamps so each poll is O(k log n) for
+      the k due files instead of scanning every queued entry
     """
-    
+
     def __init__(self, max_retries=5):
         self.max_retries = max_retries
-        self.queue = {}  # {file_path: {'folder': str, 'attempts': int, 'last_retry': float, 'user_choice': dict}}
-    
+        self.queue = {}  # {file_path: {'folder': str, 'attempts': int, 'last_retry': float, 'next_ready_at': float, 'user_choice': dict}}
+        self._heap = []  # [(next_ready_at, file_path)] with lazy deletion
+
+    def _schedule(self, file_path, data):
+        """Compute next_ready_at from backoff and push onto the heap"""
+        # Exponential backoff: 5, 10, 20, 40, 60 seconds
+        wait_time = min(5 * (2 ** data['attempts']), 60)
+        data['next_ready_at'] = data['last_retry'] + wait_time
+        heapq.heappush(self._heap, (data['next_ready_at'], file_path))
+
     def add(self, file_path, folder, user_choice=None):
         """Add a locked file to retry queue"""
-        self.queue[file_path] = {
+        data = {
+            'name': os.path.basename(file_path),  # computed once, reused every retry
             'folder': folder,
             'attempts': 0,
             'last_retry': time.time(),
             'user_choice': user_choice  # Store accept/choose/ignore decision
         }
-    
+        self.queue[file_path] = data
+        self._schedule(file_path, data)
+
     def get_ready_files(self):
         """
         Get files ready for retry based on exponential backoff
-        
+
         Returns:
-            list: [(file_path, folder, user_choice)]
+            list: [(file_path, name, folder, user_choice)]
         """
         now = time.time()
         ready = []
-        
-        for file_path, data in list(self.queue.items()):
-            attempts = data['attempts']
-            last_retry = data['last_retry']
-            
-            # Exponential backoff: 5, 10, 20, 40, 60 seconds
-            wait_time = min(5 * (2 ** attempts), 60)
-            
-            if now - last_retry >= wait_time:
-                ready.append((file_path, data['folder'], data['user_choice']))
-        
+
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            next_ready_at, file_path = heapq.heappop(self._heap)
+            data = self.queue.get(file_path)
+            # Lazy deletion: skip entries that were removed or rescheduled
+            # since this heap entry was pushed
+            if data is None or data['next_ready_at'] != next_ready_at:
+                continue
+            ready.append((file_path, data['name'], data['folder'], data['user_choice']))
+            due.append((next_ready_at, file_path))
+
+        # Re-push after draining so a still-due entry stays discoverable
+        # on later polls until mark_retry or remove resolves it, matching
+        # the old scan behaviour
+        for item in due:
+            heapq.heappush(self._heap, item)
+
         return ready
-    
+
     def mark_retry(self, file_path):
         """Mark file as retried (increment attempt counter)"""
         if file_path in self.queue:
-            self.queue[file_path]['attempts'] += 1
-            self.queue[file_path]['last_retry'] = time.time()
-    
+            data = self.queue[file_path]
+            data['attempts'] += 1
+            data['last_retry'] = time.time()
+            self._schedule(file_path, data)
+
     def remove(self, file_path):
         """Remove file from queue (success or max retries)"""
         if file_path in self.queue:
             del self.queue[file_path]
-    
+
     def should_give_up(self, file_path):
         """Check if max retries reached"""
         if file_path in self.queue:
             return self.queue[file_path]['attempts'] >= self.max_retries
         return False
-    
+
     def size(self):
         """Get queue size"""
         return len(self.queue)
-    
+
     def list_all(self):
         """List all files in queue with status"""
         return [
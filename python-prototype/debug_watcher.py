@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 """Debug watchdog event detection"""
+import heapq
 import os
 import time
 from pathlib import Path
@@ -9,12 +10,17 @@ downloads = Path("C:/Users/rongq/Downloads")
 print(f"Checking downloads: {downloads}")
 print(f"Exists: {downloads.exists()}\n")
 
-# List all files
+# List the 5 newest files - nlargest keeps a 5-element heap instead of
+# sorting the whole directory, and one stat per file covers everything
 print("Files currently in Downloads:")
-for file in sorted(downloads.glob("*"), key=lambda x: x.stat().st_mtime, reverse=True)[:5]:
-    if file.is_file():
-        mtime = time.time() - file.stat().st_mtime
-        print(f"  {file.name:40} - {mtime:.1f}s ago ({file.stat().st_size} bytes)")
+now = time.time()
+try:
+    stats = [(p, p.stat()) for p in downloads.iterdir() if p.is_file()]
+except OSError:
+    stats = []  # Directory missing - keep going, the matcher test below still runs
+for file, st in heapq.nlargest(5, stats, key=lambda x: x[1].st_mtime):
+    mtime = now - st.st_mtime
+    print(f"  {file.name:40} - {mtime:.1f}s ago ({st.st_size} bytes)")
 
 # Test matching
 test_file = downloads / "Microeconomics_test.txt"
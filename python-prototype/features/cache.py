@@ -0,0 +1,52 @@
+"""
+Shared content-extraction entry point
+
+OCR and document parsing are the most expensive per-file steps in the
+pipeline, and both the matcher and the LLM classifier want the same
+text. The underlying extractors cache by (path, mtime_ns, size), so
+each file is extracted at most once until it changes on disk; this
+module adds the image/document dispatch and batch prefetching.
+"""
+import os
+from concurrent.futures import ThreadPoolExecutor
+from features.content_extractors import extract_title, extract_image_text, is_image
+
+# Shared pool for batch extraction - OCR and document parsing are
+# native-code/I/O bound and release the GIL, so they overlap well
+_POOL = None
+
+
+def _get_pool():
+    global _POOL
+    if _POOL is None:
+        _POOL = ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1))
+    return _POOL
+
+
+def get_content(path):
+    """
+    Extract (and cache) text content for a file
+
+    OCR text for images, title/first page for documents; empty string
+    when nothing can be extracted or the file is unreadable.
+    """
+    if is_image(path):
+        return extract_image_text(path)
+    return extract_title(path)
+
+
+def extract_many(paths):
+    """
+    Extract content for several files concurrently
+
+    Results land in the shared cache, so this is a prefetch: subsequent
+    get_content calls for the same files return instantly.
+
+    Returns:
+        dict: {path: extracted content}
+    """
+    paths = list(paths)
+    if len(paths) <= 1:
+        return {p: get_content(p) for p in paths}
+
+    return dict(zip(paths, _get_pool().map(get_content, paths)))
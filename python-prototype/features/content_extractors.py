@@ -1,44 +1,56 @@
 """
 Content extraction utilities for different file types
-"""
-from pathlib import Path
 
-try:
-    from PyPDF2 import PdfReader
-except ImportError:
-    PdfReader = None
+OCR and document parsing results are cached by (path, mtime_ns, size)
+so re-scans of unchanged files return in dict-lookup time.
+"""
+import os
+from functools import lru_cache
+from importlib import import_module
 
-try:
-    from docx import Document
-except ImportError:
-    Document = None
+# Heavy parser libraries (PyPDF2, python-docx, python-pptx, Pillow,
+# pytesseract) are imported on first use rather than at package load -
+# features/__init__ pulls this module in, and the watcher may never see
+# a PDF or an image during a session
+_IMPORT_CACHE = {}
 
-try:
-    from pptx import Presentation
-except ImportError:
-    Presentation = None
 
-try:
-    from PIL import Image
-    import pytesseract
-except ImportError:
-    Image = None
-    pytesseract = None
+def _lazy_import(module, attr=None):
+    """Import a module (or one attribute) on first use; None if missing"""
+    key = (module, attr)
+    if key not in _IMPORT_CACHE:
+        try:
+            mod = import_module(module)
+            _IMPORT_CACHE[key] = getattr(mod, attr) if attr else mod
+        except ImportError:
+            _IMPORT_CACHE[key] = None
+    return _IMPORT_CACHE[key]
 
 
 def extract_image_text(file_path):
     """
-    Extract text from images using OCR
-    
+    Extract text from images using OCR (cached until the file changes)
+
     Args:
         file_path: Path to image file
-        
+
     Returns:
         str: Extracted text or empty string
     """
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return ""
+    return _extract_image_text_cached(file_path, st.st_mtime_ns, st.st_size)
+
+
+@lru_cache(maxsize=512)
+def _extract_image_text_cached(file_path, mtime_ns, size):
+    Image = _lazy_import('PIL.Image')
+    pytesseract = _lazy_import('pytesseract')
     if not Image or not pytesseract:
         return ""
-    
+
     try:
         img = Image.open(file_path)
         text = pytesseract.image_to_string(img)
@@ -47,57 +59,92 @@ def extract_image_text(file_path):
         return ""
 
 
+_IMAGE_EXTS = frozenset({'.png', '.jpg', '.jpeg'})
+
+
 def is_image(file_path):
     """Check if file is an image"""
-    ext = file_path.lower()
-    return ext.endswith(('.png', '.jpg', '.jpeg'))
+    return os.path.splitext(file_path)[1].lower() in _IMAGE_EXTS
 
 
 def extract_title(file_path):
     """
-    Extract title from PDF or DOCX files
-    
+    Extract title from PDF or DOCX files (cached until the file changes)
+
     Args:
         file_path: Path to the file
-        
+
     Returns:
         str: Extracted title or empty string
     """
-    if file_path.endswith(".pdf"):
-        if PdfReader:
-            try:
-                reader = PdfReader(file_path)
-                if reader.pages:
-                    return reader.pages[0].extract_text()[:500]
-            except Exception:
-                pass
-    elif file_path.endswith(".docx"):
-        if Document:
-            try:
-                doc = Document(file_path)
-                return " ".join(p.text for p in doc.paragraphs[:5])
-            except Exception:
-                pass
-    elif file_path.endswith(".pptx"):
-        if Presentation:
-            try:
-                prs = Presentation(file_path)
-                texts = []
-                for slide in prs.slides[:5]:
-                    for shape in slide.shapes:
-                        text = getattr(shape, "text", "")
-                        if text:
-                            texts.append(text)
-                return " ".join(texts)[:500]
-            except Exception:
-                pass
-    elif file_path.endswith(".ppt"):
-        # Old PowerPoint format - content extraction not supported
-        # Return a message so LLM knows this is a PowerPoint file
-        return "[PowerPoint file - content not extractable, old .ppt format]"
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return ""
+    return _extract_title_cached(file_path, st.st_mtime_ns, st.st_size)
+
+
+def _pdf_title(file_path):
+    PdfReader = _lazy_import('PyPDF2', 'PdfReader')
+    if PdfReader:
+        try:
+            reader = PdfReader(file_path)
+            if reader.pages:
+                return reader.pages[0].extract_text()[:500]
+        except Exception:
+            pass
+    return ""
+
+
+def _docx_title(file_path):
+    Document = _lazy_import('docx', 'Document')
+    if Document:
+        try:
+            doc = Document(file_path)
+            return " ".join(p.text for p in doc.paragraphs[:5])
+        except Exception:
+            pass
+    return ""
+
+
+def _pptx_title(file_path):
+    Presentation = _lazy_import('pptx', 'Presentation')
+    if Presentation:
+        try:
+            prs = Presentation(file_path)
+            texts = []
+            for slide in prs.slides[:5]:
+                for shape in slide.shapes:
+                    text = getattr(shape, "text", "")
+                    if text:
+                        texts.append(text)
+            return " ".join(texts)[:500]
+        except Exception:
+            pass
     return ""
 
 
+def _ppt_title(file_path):
+    # Old PowerPoint format - content extraction not supported
+    # Return a message so LLM knows this is a PowerPoint file
+    return "[PowerPoint file - content not extractable, old .ppt format]"
+
+
+# One dict lookup on the extension replaces the endswith chain
+_TITLE_DISPATCH = {
+    '.pdf': _pdf_title,
+    '.docx': _docx_title,
+    '.pptx': _pptx_title,
+    '.ppt': _ppt_title,
+}
+
+
+@lru_cache(maxsize=512)
+def _extract_title_cached(file_path, mtime_ns, size):
+    extractor = _TITLE_DISPATCH.get(os.path.splitext(file_path)[1].lower())
+    return extractor(file_path) if extractor else ""
+
+
 def extract_text_content(file_path, max_length=1000):
     """
     Extract text content from a file
@@ -109,20 +156,20 @@ def extract_text_content(file_path, max_length=1000):
     Returns:
         str: Extracted text content
     """
-    path = Path(file_path)
-    extension = path.suffix.lower().lstrip('.')
-    
+    # Plain string ops - no need to allocate a Path per file here
+    extension = os.path.splitext(file_path)[1].lower().lstrip('.')
+
     try:
         if extension in ['txt', 'md', 'log', 'csv']:
-            return extract_plain_text(path, max_length)
+            return extract_plain_text(file_path, max_length)
         elif extension in ['pdf']:
-            return extract_pdf_text(path, max_length)
+            return extract_pdf_text(file_path, max_length)
         elif extension in ['doc', 'docx']:
-            return extract_doc_text(path, max_length)
+            return extract_doc_text(file_path, max_length)
         else:
             return ""
     except Exception as e:
-        print(f"Error extracting content from {path}: {e}")
+        print(f"Error extracting content from {file_path}: {e}")
         return ""
 
 
@@ -139,6 +186,7 @@ def extract_plain_text(file_path, max_length=1000):
 
 def extract_pdf_text(file_path, max_length=1000):
     """Extract text from PDF files"""
+    PdfReader = _lazy_import('PyPDF2', 'PdfReader')
     if not PdfReader:
         return ""
     
@@ -154,6 +202,7 @@ def extract_pdf_text(file_path, max_length=1000):
 
 def extract_doc_text(file_path, max_length=1000):
     """Extract text from Word documents"""
+    Document = _lazy_import('docx', 'Document')
     if not Document:
         return ""
     
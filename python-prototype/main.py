@@ -1,14 +1,21 @@
 # main.py
 
 import os
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from io import StringIO
 from watcher.download_watcher import start_downloads_watcher
-from agent.matcher import match
-from agent.decision import decide_action
-from telemetry.events import log_event
-from actions.mover import move_file
+from agent.matcher import match, collect_available_folders
+from agent.decision import decide_action, build_decision_lut
+from agent.llm_classifier import classify_files_batch, llm_available
+from agent.learning_logic import clear_learning_caches, get_confidence_with_learning_bulk
+from features.cache import extract_many
+from telemetry.events import log_event, flush_events
+from actions.mover import move_file, move_files, move_dispatcher
 from storage.local_store import (
     init_db, load_scopes, save_decision, save_ignore, save_learning,
-    is_file_ignored, matches_ignore_pattern, save_ignore_pattern
+    is_file_ignored, matches_ignore_pattern, save_ignore_pattern, has_decision,
+    load_ignore_snapshot, matches_ignore_pattern_snapshot, save_batch_feedback
 )
 from config.settings import AUTO_MOVE_TH, SUGGEST_TH, BATCH_WINDOW_SECONDS
 from agent.batch import BatchManager
@@ -25,10 +32,14 @@ processing_state = get_processing_state()  # Global state for coordinating proce
 batch_manager = BatchManager(window_seconds=BATCH_WINDOW_SECONDS)
 locked_files = LockedFileQueue(max_retries=5)
 
+# Thresholds are fixed for the process lifetime, so the action for every
+# whole confidence percent is precomputed once
+_DECISION_LUT = build_decision_lut(AUTO_MOVE_TH, SUGGEST_TH)
 
-def handle_new_file(file_path):
-    """Queue files for batch processing"""
-    batch_manager.add_file(file_path)
+
+def handle_new_files(file_paths):
+    """Queue a group of newly ready files for batch processing"""
+    batch_manager.add_files(file_paths)
 
 
 def handle_single_file(file_path):
@@ -37,17 +48,22 @@ def handle_single_file(file_path):
     No batching, no UI prompt - just auto-move if confident or ask if borderline
     """
     filename = os.path.basename(file_path)
-    
+
+    # Fresh learning stats for this invocation
+    clear_learning_caches()
+
     # Skip ignored files
     if is_file_ignored(filename):
         log_event("file_skipped", {"reason": "already_ignored"})
+        flush_events()
         return
-    
+
     if matches_ignore_pattern(filename):
         log_event("file_skipped", {"reason": "matches_ignore_pattern"})
         save_ignore(filename, "matches_ignore_pattern")
+        flush_events()
         return
-    
+
     result = match(file_path, scopes)
     if not result["folder"]:
         return
@@ -95,6 +111,9 @@ def handle_single_file(file_path):
             save_ignore(filename, "user_ignored_suggestion")
             ask_ignore_pattern(filename)
 
+    # One write covers every event this file generated
+    flush_events()
+
 
 def handle_batch(file_paths):
     """
@@ -108,122 +127,241 @@ def handle_batch(file_paths):
     suggestions = []
     skipped = []
 
-    # First pass: categorize files
+    # Batch output is staged in one buffer and written to the terminal
+    # at user-visibility boundaries (just before a prompt, and at the
+    # end of the batch) - one write per boundary instead of one syscall
+    # per print. The input() prompts themselves are never buffered.
+    out = StringIO()
+
+    def bprint(line=""):
+        out.write(line + "\n")
+
+    def flush_output():
+        text = out.getvalue()
+        if text:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            out.seek(0)
+            out.truncate()
+
+    # Fresh learning stats for this batch; repeats within it are served
+    # from the memoized accessors
+    clear_learning_caches()
+
+    # One read of the ignore tables covers the whole batch - per-file
+    # checks below are set lookups and precompiled regex matches
+    ignore_snapshot = load_ignore_snapshot()
+    ignored_names = ignore_snapshot[0]
+
+    # Classify the files that will actually need an LLM answer (not
+    # ignored, no remembered decision) in one batched request; match()
+    # below receives the precomputed results instead of calling per file
+    pending = [
+        p for p in file_paths
+        if os.path.basename(p) not in ignored_names
+        and not matches_ignore_pattern_snapshot(os.path.basename(p), ignore_snapshot)
+        and not has_decision(os.path.basename(p))
+    ]
+    llm_results = {}
+    if len(pending) > 1 and llm_available():
+        # Warm the shared content cache (OCR/title extraction) in
+        # parallel before anything downstream asks for it. With the LLM
+        # disabled this is all skipped - the fallback matcher extracts
+        # content itself only for files whose names score too low.
+        extract_many(pending)
+        llm_results = classify_files_batch(pending, collect_available_folders(scopes))
+
+    # First pass: match files without learning - the adjustments for the
+    # whole batch are then fetched with two bulk queries instead of two
+    # per file. The working set is kept as parallel arrays
+    # (structure-of-arrays) so the later passes walk flat lists by index
+    # instead of packing and unpacking a tuple per file
+    m_paths, m_names, m_folders, m_bases, m_memory = [], [], [], [], []
     for file_path in file_paths:
         filename = os.path.basename(file_path)
-        
+
         # Skip files that user already ignored
-        if is_file_ignored(filename):
+        if filename in ignored_names:
             log_event("file_skipped", {"reason": "already_ignored"})
             skipped.append(filename)
             continue
-        
+
         # Skip files matching ignore patterns
-        if matches_ignore_pattern(filename):
+        if matches_ignore_pattern_snapshot(filename, ignore_snapshot):
             log_event("file_skipped", {"reason": "matches_ignore_pattern"})
             save_ignore(filename, "matches_ignore_pattern")
             skipped.append(filename)
             continue
-        
-        result = match(file_path, scopes)
+
+        result = match(
+            file_path, scopes,
+            precomputed_llm_result=llm_results.get(file_path),
+            apply_learning=False
+        )
         if not result["folder"]:
             continue
 
-        confidence = result["confidence"]
-        folder = result["folder"]
-        action = decide_action(confidence, AUTO_MOVE_TH, SUGGEST_TH)
+        m_paths.append(file_path)
+        m_names.append(filename)
+        m_folders.append(result["folder"])
+        m_bases.append(result["confidence"])
+        m_memory.append(result["memory_score"])
+
+    # Bulk learning pass over the whole batch. Remembered decisions
+    # skip it: match() trusts memory completely on the single-file
+    # path, so adjusting them here would let old choose rows demote a
+    # file the other path auto-moves.
+    adjust_idx = [i for i, m in enumerate(m_memory) if m == 0]
+    adjusted = get_confidence_with_learning_bulk(
+        [(m_bases[i], m_names[i], m_folders[i]) for i in adjust_idx]
+    )
+    confidences = m_bases[:]
+    for i, confidence in zip(adjust_idx, adjusted):
+        confidences[i] = confidence
+
+    # Second pass: act on the adjusted confidences. High-confidence
+    # files are collected and moved together so per-move bookkeeping
+    # (folder creation, undo-history commits) is amortized
+    auto_candidates = []
+    for i, confidence in enumerate(confidences):
+        action = _DECISION_LUT[int(confidence * 100)]
 
         if action == "auto_move":
             log_event("auto_move", {"confidence_bucket": "high"})
-            success, error = move_file(file_path, folder)
-            if success:
-                save_decision(filename, folder)
-                save_learning(filename, folder, "accept")
-                auto_moved.append((filename, folder))
-            elif error == 'locked':
-                locked_files.add(file_path, folder, {'action': 'accept', 'folder': folder})
+            auto_candidates.append((m_paths[i], m_names[i], m_folders[i]))
         elif action == "ask":
             log_event("suggestion_shown", {"confidence_bucket": "medium"})
-            suggestions.append((file_path, folder, confidence))
+            # Carry the basename along - stage 2 and the UI key on it
+            suggestions.append((m_paths[i], m_names[i], m_folders[i], confidence))
+
+    move_results = move_files([(fp, folder) for fp, _, folder in auto_candidates])
+    for file_path, filename, folder in auto_candidates:
+        success, error = move_results[file_path]
+        if success:
+            auto_moved.append((filename, folder))
+        elif error == 'locked':
+            locked_files.add(file_path, folder, {'action': 'accept', 'folder': folder})
+
+    # One transaction (one WAL fsync) covers the whole batch's decision
+    # and learning rows instead of two commits per moved file
+    save_batch_feedback(
+        auto_moved,
+        [(filename, folder, "accept") for filename, folder in auto_moved]
+    )
 
     # Stage 1 notification: console log showing readiness
     total_files = len(auto_moved) + len(suggestions) + len(skipped)
     if total_files > 0:
-        print(f"\n[info] {total_files} files ready to organise")
+        bprint(f"\n[info] {total_files} files ready to organise")
         if auto_moved:
-            print(f"       ✓ {len(auto_moved)} auto-moved")
+            bprint(f"       ✓ {len(auto_moved)} auto-moved")
         if suggestions:
-            print(f"       ? {len(suggestions)} need your decision")
+            bprint(f"       ? {len(suggestions)} need your decision")
         if skipped:
-            print(f"       ⊘ {len(skipped)} skipped (ignored patterns)")
+            bprint(f"       ⊘ {len(skipped)} skipped (ignored patterns)")
         if locked_files.size() > 0:
-            print(f"       🔒 {locked_files.size()} locked (will retry)")
+            bprint(f"       🔒 {locked_files.size()} locked (will retry)")
 
     # STAGE 2: Interactive prompt for user decisions
     if suggestions:
-        user_decisions = display_batch_summary(auto_moved, suggestions)
+        # The summary prompts for input - everything staged so far must
+        # be on screen first
+        flush_output()
+        user_decisions = display_batch_summary(
+            auto_moved,
+            [(filename, folder, confidence)
+             for _, filename, folder, confidence in suggestions]
+        )
 
         # Check if user cancelled (empty decisions)
         if not user_decisions:
             print("\n[INFO] No decisions made - operation cancelled\n")
+            flush_events()
             return
 
-        print(f"\n[INFO] Processing {len(user_decisions)} user decisions...")
-
-        for file_path, suggested_folder, confidence in suggestions:
-            filename = os.path.basename(file_path)
+        bprint(f"\n[INFO] Processing {len(user_decisions)} user decisions...")
 
+        # Split the decisions: moves are independent filesystem work and
+        # can run concurrently; ignores prompt the user and stay here.
+        # Jobs carry (file_path, filename, suggested_folder, confidence,
+        # action_type, target_folder)
+        move_jobs = []
+        for file_path, filename, suggested_folder, confidence in suggestions:
             if filename not in user_decisions:
-                print(f"[SKIP] {filename} - no decision found")
+                bprint(f"[SKIP] {filename} - no decision found")
                 continue
 
             action_type, chosen_folder = user_decisions[filename]
-            print(f"\n[PROCESS] {filename}")
-            print(f"          Action: {action_type}")
 
             if action_type == "accept":
                 # User accepted the suggestion
                 log_event("suggestion_accepted", {"confidence": confidence})
-                print(f"          Moving to: {os.path.basename(suggested_folder)}")
-                success, error = move_file(file_path, suggested_folder)
-                if success:
-                    save_decision(filename, suggested_folder)
-                    save_learning(filename, suggested_folder, "accept")
-                elif error == 'locked':
-                    print(f"          File locked - will retry later")
-                    locked_files.add(file_path, suggested_folder, {'action': 'accept', 'folder': suggested_folder})
-                elif error == 'duplicate':
-                    print(f"          Duplicate detected - skipped")
-                else:
-                    print(f"          Error: {error}")
+                move_jobs.append((file_path, filename, suggested_folder, confidence, "accept", suggested_folder))
 
             elif action_type == "choose":
                 # User chose a different folder (strong negative feedback)
                 log_event("suggestion_rejected_with_alternative", {"confidence": confidence})
                 if chosen_folder:
-                    print(f"          Moving to: {os.path.basename(chosen_folder)}")
-                    success, error = move_file(file_path, chosen_folder)
-                    if success:
-                        save_decision(filename, chosen_folder)
-                        save_learning(filename, suggested_folder, "choose")  # Learn that suggestion was wrong
-                    elif error == 'locked':
-                        print(f"          File locked - will retry later")
-                        locked_files.add(file_path, chosen_folder, {'action': 'choose', 'folder': chosen_folder, 'suggested': suggested_folder})
-                    elif error == 'duplicate':
-                        print(f"          Duplicate detected - skipped")
-                    else:
-                        print(f"          Error: {error}")
+                    move_jobs.append((file_path, filename, suggested_folder, confidence, "choose", chosen_folder))
 
             elif action_type == "ignore":
                 # User ignored the file (no learning, no move)
                 log_event("file_ignored", {"confidence": confidence})
                 save_ignore(filename, "user_ignored_suggestion")
-                print(f"          Ignored - no move")
+                bprint(f"\n[PROCESS] {filename}")
+                bprint(f"          Ignored - no move")
 
-                # Ask if user wants to ignore similar files in the future
+                # Ask if user wants to ignore similar files in the
+                # future - prompts, so staged output goes out first
+                flush_output()
                 ask_ignore_pattern(filename)
 
-        print(f"\n[DONE] Batch processing complete\n")
+        # Run the moves in parallel: each one mostly waits on the OS (the
+        # GIL is released during file syscalls), and the dispatcher
+        # serializes moves landing on the same physical device
+        move_results = {}
+        if move_jobs:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                futures = {
+                    pool.submit(move_dispatcher.move, fp, target): fp
+                    for fp, _, _, _, _, target in move_jobs
+                }
+                for future in as_completed(futures):
+                    move_results[futures[future]] = future.result()
+
+        # Bookkeeping stays sequential: the DB writes and the retry queue
+        # aren't worth locking for, and it keeps the output readable
+        decisions_to_save = []
+        learnings_to_save = []
+        for file_path, filename, suggested_folder, confidence, action_type, target in move_jobs:
+            success, error = move_results[file_path]
+            bprint(f"\n[PROCESS] {filename}")
+            bprint(f"          Action: {action_type}")
+            bprint(f"          Moving to: {os.path.basename(target)}")
+
+            if success:
+                decisions_to_save.append((filename, target))
+                # For 'choose', learn that the original suggestion was wrong
+                learnings_to_save.append((filename, suggested_folder, action_type))
+            elif error == 'locked':
+                bprint(f"          File locked - will retry later")
+                entry = {'action': action_type, 'folder': target}
+                if action_type == "choose":
+                    entry['suggested'] = suggested_folder
+                locked_files.add(file_path, target, entry)
+            elif error == 'duplicate':
+                bprint(f"          Duplicate detected - skipped")
+            else:
+                bprint(f"          Error: {error}")
+
+        save_batch_feedback(decisions_to_save, learnings_to_save)
+
+        bprint(f"\n[DONE] Batch processing complete\n")
+
+    # End of batch: everything still staged goes out in one write,
+    # followed by the batch's telemetry
+    flush_output()
+    flush_events()
 
 
 def ask_ignore_pattern(filename):
@@ -235,30 +373,32 @@ def ask_ignore_pattern(filename):
     Args:
         filename: File that was ignored
     """
-    # Suggest common patterns based on file characteristics
+    # Suggest common patterns based on file characteristics - one
+    # splitext and one lower() cover all the checks below
     ext = os.path.splitext(filename)[1].lower()
-    name_prefix = os.path.splitext(filename)[0]
-    
+    lower = filename.lower()
+
     suggestions = []
-    
+
     # Extension-based pattern
     if ext:
         suggestions.append(f"*{ext}")
-    
+
     # Common temporary file patterns
     if filename.startswith("~"):
         suggestions.append("~*")
     if filename.startswith("."):
         suggestions.append(".*")
-    if "tmp" in filename.lower() or "temp" in filename.lower():
+    if "tmp" in lower:
         suggestions.append("*tmp*")
+    if "temp" in lower:
         suggestions.append("*temp*")
-    
+
     if not suggestions:
         return
-    
-    # Deduplicate
-    suggestions = list(set(suggestions))
+
+    # Deduplicate preserving suggestion order (set() shuffled the menu)
+    suggestions = list(dict.fromkeys(suggestions))
     
     print(f"\n❓ Should we ignore files like '{filename}' in the future?")
     for i, pattern in enumerate(suggestions, 1):
@@ -286,33 +426,33 @@ def process_locked_retries():
         return 0
     
     moved_count = 0
-    for file_path, folder, user_choice in ready_files:
-        if not os.path.exists(file_path):
-            # File was moved/deleted externally
-            locked_files.remove(file_path)
-            continue
-        
-        filename = os.path.basename(file_path)
+    decisions_to_save = []
+    learnings_to_save = []
+    for file_path, filename, folder, user_choice in ready_files:
+        # No per-retry basename or existence stat: the name was computed
+        # when the file was queued, and a file deleted externally just
+        # fails the move with a non-locked error and drops out below
         success, error = move_file(file_path, folder)
-        
+
         if success:
             # Successfully moved!
             moved_count += 1
             locked_files.remove(file_path)
-            
-            # Apply user's original decision
+
+            # Apply user's original decision (persisted in one
+            # transaction after the loop)
             if user_choice:
                 action = user_choice.get('action')
                 if action == 'accept':
-                    save_decision(filename, folder)
-                    save_learning(filename, folder, "accept")
+                    decisions_to_save.append((filename, folder))
+                    learnings_to_save.append((filename, folder, "accept"))
                 elif action == 'choose':
-                    save_decision(filename, folder)
+                    decisions_to_save.append((filename, folder))
                     suggested = user_choice.get('suggested', folder)
-                    save_learning(filename, suggested, "choose")
-            
+                    learnings_to_save.append((filename, suggested, "choose"))
+
             print(f"🔓 Retry success: {filename} → {os.path.basename(folder)}")
-            
+
         elif error == 'locked':
             # Still locked - increment retry counter
             locked_files.mark_retry(file_path)
@@ -323,37 +463,29 @@ def process_locked_retries():
         else:
             # Other error - remove from queue
             locked_files.remove(file_path)
-    
-    return moved_count
-
 
-def resolve_downloads_path():
-    """Resolve the most likely Downloads folder on Windows/OneDrive setups."""
-    candidates = []
-
-    user_profile = os.environ.get("USERPROFILE")
-    if user_profile:
-        candidates.append(os.path.join(user_profile, "Downloads"))
-
-    one_drive = os.environ.get("OneDrive")
-    if one_drive:
-        candidates.append(os.path.join(one_drive, "Downloads"))
-
-    one_drive_consumer = os.environ.get("OneDriveConsumer")
-    if one_drive_consumer:
-        candidates.append(os.path.join(one_drive_consumer, "Downloads"))
+    save_batch_feedback(decisions_to_save, learnings_to_save)
+    return moved_count
 
-    one_drive_commercial = os.environ.get("OneDriveCommercial")
-    if one_drive_commercial:
-        candidates.append(os.path.join(one_drive_commercial, "Downloads"))
 
-    candidates.append(os.path.expanduser("~/Downloads"))
+def _downloads_candidates():
+    """Yield candidate Downloads folders lazily, most likely first."""
+    env = os.environ.get
+    for var in ("USERPROFILE", "OneDrive", "OneDriveConsumer", "OneDriveCommercial"):
+        root = env(var)
+        if root:
+            yield os.path.join(root, "Downloads")
+    yield os.path.expanduser("~/Downloads")
 
-    for path in candidates:
-        if path and os.path.exists(path):
-            return path
 
-    return os.path.expanduser("~/Downloads")
+def resolve_downloads_path():
+    """Resolve the most likely Downloads folder on Windows/OneDrive setups."""
+    # Lazy generator: stops at the first existing candidate instead of
+    # building and joining the full list up front
+    return next(
+        (path for path in _downloads_candidates() if os.path.exists(path)),
+        os.path.expanduser("~/Downloads")
+    )
 
 
 if __name__ == "__main__":
@@ -371,7 +503,7 @@ if __name__ == "__main__":
     try:
         start_downloads_watcher(
             downloads_path,
-            handle_new_file,
+            handle_new_files,
             on_batch_callback=on_batch_ready,
             batch_manager=batch_manager,
             retry_callback=process_locked_retries,
@@ -382,3 +514,6 @@ if __name__ == "__main__":
         print(f"\n[ERROR] Fatal error: {e}")
         traceback.print_exc()
         exit(1)
+    finally:
+        # Don't lose events buffered between flush points on shutdown
+        flush_events()
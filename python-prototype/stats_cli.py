@@ -16,149 +16,145 @@ Usage:
 import sys
 import os
 from agent.learning_logic import get_learning_insights
-from storage.local_store import get_undo_history
-import sqlite3
+from storage.local_store import get_connection, get_undo_history
+
+# Built once at import, not per feedback row
+_ACTION_SYMBOL = {'accept': '✓', 'choose': '⚠', 'ignore': '⊘'}
 
 
 def show_dashboard():
     """Display full analytics dashboard"""
 
-    print("\n" + "="*70)
-    print(" 📊 File Organizer - Learning Analytics Dashboard")
-    print("="*70)
+    # The report is assembled in memory and emitted with one stdout
+    # write at the end - per-line print calls each lock and flush the
+    # stream, which is noticeably slow on Windows consoles
+    out = []
+    add = out.append
+
+    add("\n" + "="*70 + "\n")
+    add(" 📊 File Organizer - Learning Analytics Dashboard\n")
+    add("="*70 + "\n")
 
     # Get insights
     insights = get_learning_insights(limit=10)
 
-    # Overall stats
-    conn = sqlite3.connect("storage/state.db")
-    c = conn.cursor()
-
-    # Total suggestions made
-    c.execute("SELECT COUNT(*) FROM learning")
-    total_suggestions = c.fetchone()[0]
-
-    # Breakdown by action
+    # Overall stats: one round-trip on the shared connection returns
+    # every counter via conditional aggregation instead of four queries
+    # (and their four VDBE prepare/parse passes) on a throwaway connect
+    c = get_connection().cursor()
     c.execute("""
-        SELECT action, COUNT(*)
+        SELECT
+            COUNT(*),
+            SUM(CASE WHEN action = 'accept' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN action = 'choose' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN action = 'ignore' THEN 1 ELSE 0 END),
+            (SELECT COUNT(*) FROM undo_history),
+            (SELECT COUNT(*) FROM decisions)
         FROM learning
-        GROUP BY action
     """)
-    action_counts = dict(c.fetchall())
-
-    # Total moves (from undo history)
-    c.execute("SELECT COUNT(*) FROM undo_history")
-    total_moves = c.fetchone()[0]
-
-    # Total decisions
-    c.execute("SELECT COUNT(*) FROM decisions")
-    total_decisions = c.fetchone()[0]
-
-    conn.close()
+    (total_suggestions, accepts, rejects, ignores,
+     total_moves, total_decisions) = c.fetchone()
 
     # Display overall stats
-    print("\n📈 Overall Statistics")
-    print("-" * 70)
-    print(f"  Total Suggestions Made:     {total_suggestions}")
-    print(f"  Total Moves Executed:       {total_moves}")
-    print(f"  Total Decisions Stored:     {total_decisions}")
+    add("\n📈 Overall Statistics\n")
+    add("-" * 70 + "\n")
+    add(f"  Total Suggestions Made:     {total_suggestions}\n")
+    add(f"  Total Moves Executed:       {total_moves}\n")
+    add(f"  Total Decisions Stored:     {total_decisions}\n")
 
     if total_suggestions > 0:
-        accepts = action_counts.get('accept', 0)
-        rejects = action_counts.get('choose', 0)
-        ignores = action_counts.get('ignore', 0)
-
-        print(f"\n  User Feedback Breakdown:")
-        print(f"    ✓ Accepted:    {accepts:3d} ({accepts/total_suggestions*100:5.1f}%)")
-        print(f"    ⚠ Rejected:    {rejects:3d} ({rejects/total_suggestions*100:5.1f}%)")
-        print(f"    ⊘ Ignored:     {ignores:3d} ({ignores/total_suggestions*100:5.1f}%)")
+        add(f"\n  User Feedback Breakdown:\n")
+        add(f"    ✓ Accepted:    {accepts:3d} ({accepts/total_suggestions*100:5.1f}%)\n")
+        add(f"    ⚠ Rejected:    {rejects:3d} ({rejects/total_suggestions*100:5.1f}%)\n")
+        add(f"    ⊘ Ignored:     {ignores:3d} ({ignores/total_suggestions*100:5.1f}%)\n")
 
         if accepts + rejects > 0:
             accuracy = accepts / (accepts + rejects) * 100
-            print(f"\n  Model Accuracy: {accuracy:.1f}% (excludes ignores)")
+            add(f"\n  Model Accuracy: {accuracy:.1f}% (excludes ignores)\n")
 
     # Top folders
     if insights['top_folders']:
-        print("\n✅ Top Performing Folders (High Acceptance Rate)")
-        print("-" * 70)
-        for folder, accept_rate, total in insights['top_folders'][:5]:
-            folder_name = os.path.basename(folder)
-            print(f"  {folder_name:30s}  {accept_rate*100:5.1f}%  ({total} suggestions)")
+        add("\n✅ Top Performing Folders (High Acceptance Rate)\n")
+        add("-" * 70 + "\n")
+        rows = insights['top_folders'][:5]
+        names = [os.path.basename(f) for f, _, _ in rows]
+        add("".join(
+            f"  {name:30s}  {accept_rate*100:5.1f}%  ({total} suggestions)\n"
+            for name, (_, accept_rate, total) in zip(names, rows)
+        ))
 
     # Problem folders
     if insights['problem_folders']:
-        print("\n❌ Problem Folders (High Rejection Rate)")
-        print("-" * 70)
-        for folder, reject_rate, total in insights['problem_folders'][:5]:
-            folder_name = os.path.basename(folder)
-            print(f"  {folder_name:30s}  {reject_rate*100:5.1f}%  ({total} suggestions)")
+        add("\n❌ Problem Folders (High Rejection Rate)\n")
+        add("-" * 70 + "\n")
+        rows = insights['problem_folders'][:5]
+        names = [os.path.basename(f) for f, _, _ in rows]
+        add("".join(
+            f"  {name:30s}  {reject_rate*100:5.1f}%  ({total} suggestions)\n"
+            for name, (_, reject_rate, total) in zip(names, rows)
+        ))
 
     # Recent feedback
     if insights['recent_feedback']:
-        print("\n🕐 Recent User Feedback")
-        print("-" * 70)
-        for filename, folder, action, timestamp in insights['recent_feedback'][:5]:
-            folder_name = os.path.basename(folder)
-            timestamp_short = timestamp.split('T')[0] if 'T' in timestamp else timestamp
-
-            action_symbol = {
-                'accept': '✓',
-                'choose': '⚠',
-                'ignore': '⊘'
-            }.get(action, '?')
-
-            print(f"  {action_symbol} {filename[:30]:30s} → {folder_name:20s}  {timestamp_short}")
+        add("\n🕐 Recent User Feedback\n")
+        add("-" * 70 + "\n")
+        add("".join(
+            f"  {_ACTION_SYMBOL.get(action, '?')} {filename[:30]:30s}"
+            f" → {os.path.basename(folder):20s}"
+            f"  {timestamp.split('T')[0] if 'T' in timestamp else timestamp}\n"
+            for filename, folder, action, timestamp in insights['recent_feedback'][:5]
+        ))
 
     # Undo history
     recent_undos = get_undo_history(3)
     if recent_undos:
-        print("\n↩️  Recent Undos (Mistakes Corrected)")
-        print("-" * 70)
-        for entry in recent_undos:
-            filename = entry['file']
-            from_folder = os.path.basename(os.path.dirname(entry['from']))
-            to_folder = os.path.basename(os.path.dirname(entry['to']))
-            timestamp = entry['timestamp'].split('T')[0]
-            print(f"  {filename[:30]:30s}  {to_folder} → {from_folder}  {timestamp}")
+        add("\n↩️  Recent Undos (Mistakes Corrected)\n")
+        add("-" * 70 + "\n")
+        add("".join(
+            f"  {entry.file[:30]:30s}"
+            f"  {os.path.basename(os.path.dirname(entry.dst))}"
+            f" → {os.path.basename(os.path.dirname(entry.src))}"
+            f"  {entry.timestamp.split('T')[0]}\n"
+            for entry in recent_undos
+        ))
 
-    print("\n" + "="*70)
-    print("\nTip: Use 'python undo_cli.py' to undo incorrect moves")
-    print("="*70 + "\n")
+    add("\n" + "="*70 + "\n")
+    add("\nTip: Use 'python undo_cli.py' to undo incorrect moves\n")
+    add("="*70 + "\n\n")
+
+    sys.stdout.write("".join(out))
 
 
 def show_summary():
     """Display brief summary"""
 
-    conn = sqlite3.connect("storage/state.db")
-    c = conn.cursor()
-
-    # Get action breakdown
+    # Same conditional-aggregation trick as the dashboard: one query on
+    # the shared connection replaces the GROUP BY scan + Python tally
+    c = get_connection().cursor()
     c.execute("""
-        SELECT action, COUNT(*)
+        SELECT
+            COUNT(*),
+            SUM(CASE WHEN action = 'accept' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN action = 'choose' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN action = 'ignore' THEN 1 ELSE 0 END)
         FROM learning
-        GROUP BY action
     """)
-    action_counts = dict(c.fetchall())
-    conn.close()
-
-    total = sum(action_counts.values())
+    total, accepts, rejects, ignores = c.fetchone()
 
     if total == 0:
         print("\nNo learning data yet. Start using the file organizer to see stats!")
         return
 
-    accepts = action_counts.get('accept', 0)
-    rejects = action_counts.get('choose', 0)
-    ignores = action_counts.get('ignore', 0)
-
-    print(f"\n📊 Quick Stats: {total} total suggestions")
-    print(f"   ✓ {accepts} accepted  ⚠ {rejects} rejected  ⊘ {ignores} ignored")
-
+    # Short report, same single-write emission as the dashboard
+    out = [
+        f"\n📊 Quick Stats: {total} total suggestions\n",
+        f"   ✓ {accepts} accepted  ⚠ {rejects} rejected  ⊘ {ignores} ignored\n",
+    ]
     if accepts + rejects > 0:
         accuracy = accepts / (accepts + rejects) * 100
-        print(f"   Accuracy: {accuracy:.1f}%")
-
-    print()
+        out.append(f"   Accuracy: {accuracy:.1f}%\n")
+    out.append("\n")
+    sys.stdout.write("".join(out))
 
 
 def main():
@@ -1,6 +1,6 @@
 """
 Telemetry module for logging events
 """
-from .events import log_event
+from .events import log_event, flush_events
 
-__all__ = ['log_event']
+__all__ = ['log_event', 'flush_events']
@@ -1,19 +1,67 @@
 # telemetry/events.py
 
+import atexit
+import io
+import os
+import sys
+from collections import deque
+
+# Events accumulate here and reach the console in one write at flush
+# points, instead of one print (and one syscall) per event in the middle
+# of hot loops. Flushing stays at explicit call sites (prompt
+# boundaries) rather than on a background-thread timer, which would
+# interleave telemetry with interactive prompts. Bounded so a missing
+# flush can't grow without limit; overflow is counted, not silent.
+_BUFFER = deque(maxlen=4096)
+_dropped = 0
+
+
 def log_event(event, payload=None):
     """
     Log telemetry events
-    
+
     For now:
-    - prints to console
-    
+    - buffers console lines; flush_events() emits them
+
     Later — file / analytics / server
-    
+
     No filenames. No paths. No content.
-    
+
     Args:
         event: Event name
         payload: Optional event data (dict)
     """
+    global _dropped
     payload = payload or {}
-    print(f"[TELEMETRY] {event} | {payload}")
+    if len(_BUFFER) == _BUFFER.maxlen:
+        _dropped += 1  # deque is about to evict the oldest line
+    _BUFFER.append(f"[TELEMETRY] {event} | {payload}\n")
+
+
+def flush_events():
+    """Emit all buffered telemetry lines in a single write"""
+    global _dropped
+    if not _BUFFER:
+        return
+    if _dropped:
+        _BUFFER.append(
+            f"[TELEMETRY] events_dropped | {{'count': {_dropped}}}\n"
+        )
+        _dropped = 0
+    data = "".join(_BUFFER)
+    _BUFFER.clear()
+    # Drain Python's own stdout buffer first so telemetry lands after
+    # any prints that preceded it
+    sys.stdout.flush()
+    try:
+        os.write(sys.stdout.fileno(), data.encode())
+    except (OSError, ValueError, io.UnsupportedOperation):
+        # stdout isn't fd-backed (pytest capture, IDE consoles, any
+        # sys.stdout replacement) - still a single write call
+        sys.stdout.write(data)
+        sys.stdout.flush()
+
+
+# Last-resort flush so CLI exits that skip the explicit flush points
+# don't silently lose buffered events
+atexit.register(flush_events)
@@ -95,12 +95,19 @@ def test_database_schema():
     required_tables = ['decisions', 'undo_history', 'ignore_state', 'learning', 'ignore_patterns']
 
     print("\n1. Checking required tables...")
+    # One UNION ALL query returns every row count instead of a separate
+    # SELECT COUNT(*) (prepare + VDBE run) per table
+    existing_tables = [t for t in required_tables if t in tables]
+    counts = {}
+    if existing_tables:
+        counts_sql = " UNION ALL ".join(
+            f"SELECT '{t}' AS name, COUNT(*) AS n FROM {t}" for t in existing_tables
+        )
+        c.execute(counts_sql)
+        counts = dict(c.fetchall())
     for table in required_tables:
-        if table in tables:
-            # Get row count
-            c.execute(f"SELECT COUNT(*) FROM {table}")
-            count = c.fetchone()[0]
-            print(f"   ✓ {table:20s} ({count} rows)")
+        if table in counts:
+            print(f"   ✓ {table:20s} ({counts[table]} rows)")
         else:
             print(f"   ✗ {table:20s} MISSING")
 
@@ -122,6 +129,52 @@ def test_database_schema():
     print("\n✓ Database schema tests completed")
 
 
+def test_query_plans():
+    """Verify the hot queries keep using their indices"""
+    print("\n" + "="*60)
+    print("TEST 5: Query Plan Verification")
+    print("="*60)
+
+    init_db()
+    conn = sqlite3.connect("storage/state.db")
+
+    # Queries that must be served by an index (not a bare table scan)
+    indexed_queries = [
+        "SELECT suggested_folder, action, COUNT(*) FROM learning GROUP BY suggested_folder, action",
+        "SELECT action, COUNT(*) FROM learning WHERE filename = 'x' AND suggested_folder = 'y' GROUP BY action",
+        "SELECT reason FROM ignore_state WHERE filename = 'x'",
+    ]
+    for q in indexed_queries:
+        plan = conn.execute("EXPLAIN QUERY PLAN " + q).fetchall()
+        details = [row[3] for row in plan]
+        print(f"   {q[:60]}...")
+        for detail in details:
+            print(f"      {detail}")
+        assert any("USING INDEX" in d or "USING COVERING INDEX" in d for d in details), \
+            f"no index used for: {q} -> {details}"
+
+    # The decisions lookup can legitimately plan as a scan while the
+    # table is near-empty (ANALYZE stats make it look cheaper), so just
+    # assert the index is still there for when the table grows
+    index_names = {
+        row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'decisions'"
+        )
+    }
+    assert "ix_decisions_filename" in index_names, index_names
+
+    # Undo history reads newest-first off the rowid order - a plain scan
+    # is fine, but a temp b-tree sort would mean the order broke
+    plan = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT * FROM undo_history ORDER BY id DESC LIMIT 10"
+    ).fetchall()
+    details = [row[3] for row in plan]
+    assert not any("TEMP B-TREE" in d for d in details), details
+
+    conn.close()
+    print("\n✓ Query plan tests completed")
+
+
 def test_confidence_scenarios():
     """Test various confidence adjustment scenarios"""
     print("\n" + "="*60)
@@ -153,6 +206,7 @@ def run_all_tests():
         test_learning_logic()
         test_learning_insights()
         test_confidence_scenarios()
+        test_query_plans()
 
         print("\n" + "="*70)
         print(" [PASS] All tests completed successfully!")
@@ -36,25 +36,34 @@ def display_batch_summary(auto_moved, suggestions):
     print(f"\n{'='*60}")
     print(f"📁 Batch Summary: {total_files} files found")
     print(f"{'='*60}")
-    
+
+    # Folder display names, computed once per unique folder (the same
+    # folder typically appears for several files in a batch)
+    folder_names = {}
+    for _, folder in auto_moved:
+        folder_names.setdefault(folder, os.path.basename(folder))
+    for _, folder, _ in suggestions:
+        folder_names.setdefault(folder, os.path.basename(folder))
+
     # Show auto-moved files (high confidence)
     if auto_moved:
         print(f"\n✅ Auto-moved ({len(auto_moved)}):")
         for filename, folder in auto_moved:
             print(f"   • {filename}")
-            print(f"     → {os.path.basename(folder)}")
-    
+            print(f"     → {folder_names[folder]}")
+
     # Show suggestions requiring user decision
     if suggestions:
         print(f"\n⚠️  Suggestions ({len(suggestions)}):")
         for i, (filename, folder, confidence) in enumerate(suggestions, 1):
-            folder_name = os.path.basename(folder)
             conf_pct = int(confidence * 100)
             print(f"   [{i}] {filename}")
-            print(f"       Suggested: {folder_name} ({conf_pct}% confidence)")
+            print(f"       Suggested: {folder_names[folder]} ({conf_pct}% confidence)")
     
-    # Collect per-file decisions
+    # Collect per-file decisions, tallying as they're recorded so the
+    # confirmation summary doesn't re-scan the dict per action type
     user_decisions = {}
+    counts = {"accept": 0, "choose": 0, "ignore": 0}
     
     if suggestions:
         print(f"\n{'='*60}")
@@ -87,7 +96,7 @@ def display_batch_summary(auto_moved, suggestions):
             print(f"{'='*60}")
             
             for filename, folder, confidence in suggestions:
-                folder_name = os.path.basename(folder)
+                folder_name = folder_names[folder]
                 conf_pct = int(confidence * 100)
                 
                 print(f"\n📄 {filename}")
@@ -100,24 +109,28 @@ def display_batch_summary(auto_moved, suggestions):
                     if choice in ["s", ""]:
                         # Accept suggested folder
                         user_decisions[filename] = ("accept", folder)
+                        counts["accept"] += 1
                         print(f"   ✓ Will move to {folder_name}")
                         break
-                        
+
                     elif choice == "o":
                         # Choose different folder
                         custom = get_user_input(f"   Enter folder path (or press Enter to skip): ").strip()
                         if custom:
                             user_decisions[filename] = ("choose", custom)
+                            counts["choose"] += 1
                             print(f"   ✓ Will move to {custom}")
                             break
                         else:
                             print(f"   Skipped - will treat as ignore")
                             user_decisions[filename] = ("ignore", None)
+                            counts["ignore"] += 1
                             break
-                            
+
                     elif choice == "i":
                         # Ignore file (don't move, don't learn)
                         user_decisions[filename] = ("ignore", None)
+                        counts["ignore"] += 1
                         print(f"   ✓ Ignored (won't affect learning)")
                         break
                     else:
@@ -126,10 +139,10 @@ def display_batch_summary(auto_moved, suggestions):
     # Final confirmation
     if suggestions:
         print(f"\n{'='*60}")
-        accepted = sum(1 for _, (a, _) in user_decisions.items() if a == "accept")
-        changed = sum(1 for _, (a, _) in user_decisions.items() if a == "choose")
-        ignored = sum(1 for _, (a, _) in user_decisions.items() if a == "ignore")
-        
+        accepted = counts["accept"]
+        changed = counts["choose"]
+        ignored = counts["ignore"]
+
         summary = []
         if accepted:
             summary.append(f"{accepted} ✓ accept")
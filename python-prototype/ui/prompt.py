@@ -1,6 +1,7 @@
 """
 User interface prompts and interactions
 """
+import sys
 
 
 def get_user_confirmation(message, default=True):
@@ -33,10 +34,13 @@ def display_menu(options):
     Returns:
         int: Selected option index (0-based)
     """
-    print("\nPlease select an option:")
-    for i, option in enumerate(options, 1):
-        print(f"{i}. {option}")
-    
+    # Build the whole menu and emit it with one write - stdout is
+    # line-buffered on a TTY, so per-line prints are one syscall each
+    body = "\n".join(f"{i}. {option}" for i, option in enumerate(options, 1))
+    sys.stdout.write(f"\nPlease select an option:\n{body}\n")
+    sys.stdout.flush()
+
+
     while True:
         try:
             choice = input("\nEnter your choice: ").strip()
@@ -57,12 +61,16 @@ def display_action_summary(action):
     Args:
         action: Action dictionary
     """
-    print("\n" + "="*50)
-    print(f"Action: {action['type'].upper()}")
-    print(f"Source: {action['source']}")
-    print(f"Target: {action['target']}")
-    print(f"Time: {action['timestamp']}")
-    print("="*50 + "\n")
+    # Single write for the whole block, as in display_menu
+    sys.stdout.write(
+        "\n" + "="*50 + "\n"
+        f"Action: {action['type'].upper()}\n"
+        f"Source: {action['source']}\n"
+        f"Target: {action['target']}\n"
+        f"Time: {action['timestamp']}\n"
+        + "="*50 + "\n\n"
+    )
+    sys.stdout.flush()
 
 
 def display_file_info(features, decision=None):
@@ -73,16 +81,22 @@ def display_file_info(features, decision=None):
         features: File features dictionary
         decision: Decision dictionary (optional)
     """
-    print("\n" + "-"*50)
-    print(f"File: {features['name']}")
-    print(f"Type: {features['extension']}")
-    print(f"Size: {features['size']} bytes")
-    print(f"Modified: {features['modified']}")
-    
+    out = [
+        "\n" + "-"*50 + "\n",
+        f"File: {features['name']}\n",
+        f"Type: {features['extension']}\n",
+        f"Size: {features['size']} bytes\n",
+        f"Modified: {features['modified']}\n",
+    ]
+
     if decision:
-        print(f"\nRecommended action:")
-        print(f"  Destination: {decision.get('target_path')}")
-        print(f"  Confidence: {decision.get('confidence', 0):.2%}")
-        print(f"  Reason: {decision.get('reason', 'N/A')}")
-    
-    print("-"*50 + "\n")
+        out.append(
+            "\nRecommended action:\n"
+            f"  Destination: {decision.get('target_path')}\n"
+            f"  Confidence: {decision.get('confidence', 0):.2%}\n"
+            f"  Reason: {decision.get('reason', 'N/A')}\n"
+        )
+
+    out.append("-"*50 + "\n\n")
+    sys.stdout.write("".join(out))
+    sys.stdout.flush()
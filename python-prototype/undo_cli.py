@@ -12,28 +12,36 @@ import sys
 from actions.undo import undo_interactive, undo_last_move, show_undo_history
 
 
-def main():
-    if len(sys.argv) > 1:
-        arg = sys.argv[1].lower()
+def _undo_last():
+    """Undo last move immediately"""
+    print("\nUndoing last move...")
+    undo_last_move()
 
-        if arg in ['--last', '-l']:
-            # Undo last move immediately
-            print("\nUndoing last move...")
-            undo_last_move()
 
-        elif arg in ['--history', '-h']:
-            # Show history only
-            show_undo_history(10)
+# Flag -> handler table built once; adding a command is one entry here
+# instead of another elif branch
+ACTIONS = {
+    '--last': _undo_last,
+    '-l': _undo_last,
+    '--history': lambda: show_undo_history(10),
+    '-h': lambda: show_undo_history(10),
+    '--help': lambda: print(__doc__),
+}
 
-        elif arg in ['--help']:
-            print(__doc__)
 
-        else:
-            print(f"Unknown argument: {arg}")
-            print(__doc__)
-    else:
+def main():
+    if len(sys.argv) < 2:
         # Interactive mode
         undo_interactive()
+        return
+
+    arg = sys.argv[1].lower()
+    action = ACTIONS.get(arg)
+    if action is None:
+        print(f"Unknown argument: {arg}")
+        print(__doc__)
+    else:
+        action()
 
 
 if __name__ == "__main__":
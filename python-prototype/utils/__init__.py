@@ -1,7 +1,26 @@
 """
 Utility functions
 """
-from .paths import expand
-from .hash import file_hash
 
-__all__ = ['expand', 'file_hash']
+# Which submodule provides each public name
+_SUBMODULE = {
+    'expand': '.paths',
+    'file_hash': '.hash',
+    'file_hashes': '.hash',
+    'quick_signature': '.hash',
+}
+
+__all__ = list(_SUBMODULE)
+
+
+def __getattr__(name):
+    # PEP 562 lazy loading: the submodule is imported on first access,
+    # so CLIs that only need expand don't pay for utils.hash's hashlib /
+    # storage imports at startup
+    target = _SUBMODULE.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(target, __name__), name)
+    globals()[name] = value  # cached - later accesses bypass __getattr__
+    return value
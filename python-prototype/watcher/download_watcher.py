@@ -1,8 +1,11 @@
 """
 Download watcher that monitors specified directories for new files
 """
+import heapq
+import threading
 import time
 import os
+from collections import OrderedDict
 from pathlib import Path
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
@@ -11,28 +14,76 @@ from watchdog.events import FileSystemEventHandler
 class DownloadsHandler(FileSystemEventHandler):
     """Watches directories for new file events with debouncing"""
 
-    def __init__(self, on_new_file_callback, debounce_seconds=2):
+    def __init__(self, on_new_files_callback, debounce_seconds=2):
         """
         Initialize the downloads handler
 
         Args:
-            on_new_file_callback: Function to call when a file is ready
+            on_new_files_callback: Function called with the list of files
+                that became ready together (one call per tick, not per
+                file - downstream work batches naturally)
             debounce_seconds: Seconds to wait for file stability
         """
-        self.on_new_file_callback = on_new_file_callback
+        self.on_new_files_callback = on_new_files_callback
         self.debounce_seconds = debounce_seconds
         self._last_seen = {}  # Track when files were last modified
-        self._sent_to_batch = set()  # Track files sent to batch (prevents re-processing)
-    
+        # Min-heap of (ready_time, path) so the readiness check pops
+        # only what's due instead of scanning every tracked file each
+        # tick. Re-modified files just push a fresh entry; stale heap
+        # entries (ready_time not matching _last_seen + debounce) are
+        # dropped lazily when they surface.
+        self._ready_heap = []
+        # Files sent to batch (prevents re-processing). Bounded: entries
+        # for batches that never get popped (or paths the cleanup pass
+        # misses) would otherwise accumulate for the life of the
+        # watcher, so the oldest are evicted past the cap.
+        self._sent_to_batch = OrderedDict()  # path -> None, insertion-ordered
+        self._sent_cap = 4096
+        # Wakes the watcher loop the moment an event arrives instead of
+        # it rediscovering the work on its next fixed-interval poll
+        self._cv = threading.Condition()
+        self._wake = False
+
+    def _notify(self):
+        with self._cv:
+            self._wake = True
+            self._cv.notify()
+
+    def wait_for_work(self, timeout):
+        """
+        Block until a filesystem event arrives or timeout elapses
+
+        The _wake flag catches events delivered between the caller's
+        last readiness check and this wait (a plain notify before the
+        wait would otherwise be lost).
+        """
+        with self._cv:
+            if not self._wake:
+                self._cv.wait(timeout)
+            self._wake = False
+
+    def track(self, file_path):
+        """
+        Start debounce tracking for a path (no-op if already tracked)
+
+        Returns:
+            bool: True if the path was newly added
+        """
+        if file_path in self._last_seen:
+            return False
+        now = time.time()
+        self._last_seen[file_path] = now
+        heapq.heappush(self._ready_heap, (now + self.debounce_seconds, file_path))
+        return True
+
     def on_created(self, event):
         """Handle file creation events - START tracking the file"""
         if event.is_directory:
             return
 
-        file_path = event.src_path
         # Only add if not already tracking (prevent duplicate detection)
-        if file_path not in self._last_seen:
-            self._last_seen[file_path] = time.time()
+        if self.track(event.src_path):
+            self._notify()
 
     def on_modified(self, event):
         """Handle file modification events - UPDATE the timestamp"""
@@ -42,9 +93,28 @@ class DownloadsHandler(FileSystemEventHandler):
         file_path = event.src_path
         # Only update timestamp if already tracking (don't re-add completed files)
         if file_path in self._last_seen:
-            self._last_seen[file_path] = time.time()
+            now = time.time()
+            self._last_seen[file_path] = now
+            # The old heap entry goes stale and is skipped when popped
+            heapq.heappush(self._ready_heap, (now + self.debounce_seconds, file_path))
+            self._notify()
         # File is still being written, keep updating the timestamp
-    
+
+    def _is_current(self, ready_time, file_path):
+        """True if a heap entry reflects the file's latest modification"""
+        last = self._last_seen.get(file_path)
+        return last is not None and last + self.debounce_seconds == ready_time
+
+    def next_deadline(self):
+        """Earliest moment a tracked file can become ready (None if idle)"""
+        heap = self._ready_heap
+        while heap:
+            ready_time, file_path = heap[0]
+            if self._is_current(ready_time, file_path):
+                return ready_time
+            heapq.heappop(heap)  # Stale - superseded or already dispatched
+        return None
+
     def process_ready_files(self):
         """
         Check which files have stopped changing and are ready to process.
@@ -53,35 +123,46 @@ class DownloadsHandler(FileSystemEventHandler):
         now = time.time()
         ready_files = []
 
-        # Check all tracked files to see if they're ready
-        for file_path, last_time in list(self._last_seen.items()):
-            # If file hasn't changed for debounce_seconds, it's ready
-            if now - last_time >= self.debounce_seconds:
-                if os.path.exists(file_path):
-                    ready_files.append(file_path)
-                # Remove from tracking regardless
-                del self._last_seen[file_path]
-
-        # Process all ready files
-        for file_path in ready_files:
+        # Pop only the due heap entries - O(1) to discover nothing is
+        # ready, no matter how many files are being tracked
+        heap = self._ready_heap
+        while heap and heap[0][0] <= now:
+            ready_time, file_path = heapq.heappop(heap)
+            if not self._is_current(ready_time, file_path):
+                continue  # Superseded by a later modification
+            # File hasn't changed for debounce_seconds - it's ready.
+            # Remove from tracking regardless of existence.
+            del self._last_seen[file_path]
+            if os.path.exists(file_path):
+                ready_files.append(file_path)
+
+        # Hand everything that became ready this tick over in one call -
+        # per-file callbacks would pay the downstream costs (DB commits,
+        # batch bookkeeping) once per file instead of once per group
+        if ready_files:
             # Mark as sent to batch IMMEDIATELY (prevents re-detection)
-            self._sent_to_batch.add(file_path)
-            self.on_new_file_callback(file_path)
+            sent = self._sent_to_batch
+            for file_path in ready_files:
+                sent[file_path] = None
+            while len(sent) > self._sent_cap:
+                sent.popitem(last=False)  # Evict the oldest entry
+            self.on_new_files_callback(ready_files)
 
 
-def start_downloads_watcher(downloads_path, on_new_file_callback, on_batch_callback=None, batch_manager=None, retry_callback=None, processing_state=None):
+def start_downloads_watcher(downloads_path, on_new_files_callback, on_batch_callback=None, batch_manager=None, retry_callback=None, processing_state=None):
     """
     Start watching a directory for new files
 
     Args:
         downloads_path: Path to the directory to watch
-        on_new_file_callback: Function to call when a new file is ready
+        on_new_files_callback: Function called with each list of newly
+            ready files
         on_batch_callback: Function to call when batch is ready
         batch_manager: BatchManager instance
         retry_callback: Function to call to process locked file retries
         processing_state: ProcessingState instance for coordinating user input
     """
-    event_handler = DownloadsHandler(on_new_file_callback)
+    event_handler = DownloadsHandler(on_new_files_callback)
     observer = Observer()
     observer.schedule(event_handler, downloads_path, recursive=False)
     observer.start()
@@ -106,23 +187,41 @@ def start_downloads_watcher(downloads_path, on_new_file_callback, on_batch_callb
             now = time.time()
             if now - last_scan >= 3:
                 last_scan = now
+                # scandir serves is_file() and stat() from the directory
+                # read itself (one syscall per entry on Windows, where
+                # readdir already carries the attributes) instead of the
+                # three stats listdir + isfile + getctime cost per file
                 try:
-                    for file in os.listdir(downloads_path):
-                        file_path = os.path.join(downloads_path, file)
-                        # Skip if already processed OR already sent to batch
-                        if os.path.isfile(file_path) and file_path not in processed_files and file_path not in event_handler._sent_to_batch:
-                            # Check if file is "new" (CREATED within last 60 seconds, not just modified)
-                            # This prevents re-processing files that were merely opened/viewed
+                    scan = os.scandir(downloads_path)
+                except OSError:
+                    scan = None  # Directory briefly unavailable (network drive)
+                if scan is not None:
+                    with scan:
+                        for entry in scan:
+                            # Recency window first: in a Downloads
+                            # folder full of old files it rejects nearly
+                            # every entry, and the stat is answered from
+                            # scandir's per-entry cache - so the common
+                            # case never reaches the membership tests or
+                            # builds the joined path string.
+                            # "New" means CREATED within the last 60
+                            # seconds (not just modified), which
+                            # prevents re-processing files that were
+                            # merely opened/viewed.
                             try:
-                                ctime = os.path.getctime(file_path)  # Creation time on Windows
-                                if now - ctime <= RECENT_WINDOW:
-                                    # Only add if NOT already tracking (CRITICAL: prevents duplicate detection!)
-                                    if file_path not in event_handler._last_seen:
-                                        event_handler._last_seen[file_path] = time.time()
-                            except:
-                                pass  # Skip files that can't be stat'd
-                except Exception as e:
-                    pass  # Silently ignore scan errors
+                                if not entry.is_file(follow_symlinks=False):
+                                    continue
+                                if now - entry.stat().st_ctime > RECENT_WINDOW:
+                                    continue  # Creation time on Windows
+                            except OSError:
+                                continue  # Entry vanished or can't be stat'd
+                            file_path = entry.path
+                            # Skip if already processed OR already sent to batch
+                            if file_path in processed_files or file_path in event_handler._sent_to_batch:
+                                continue
+                            # track() only adds paths not already
+                            # tracked (CRITICAL: prevents duplicate detection!)
+                            event_handler.track(file_path)
 
             if batch_manager and on_batch_callback and batch_manager.is_ready():
                 batch = batch_manager.pop_batch()
@@ -130,14 +229,26 @@ def start_downloads_watcher(downloads_path, on_new_file_callback, on_batch_callb
                 for file_path in batch:
                     processed_files.add(file_path)
                     # Also remove from sent_to_batch (cleanup)
-                    event_handler._sent_to_batch.discard(file_path)
+                    event_handler._sent_to_batch.pop(file_path, None)
                 on_batch_callback(batch)
 
             # Process locked file retries
             if retry_callback:
                 retry_callback()
 
-            time.sleep(1)
+            # Sleep until the next known deadline (debounce expiry, scan
+            # tick or batch window) instead of a fixed 1 s poll; the
+            # condition variable wakes us immediately on new events
+            now = time.time()
+            timeout = (last_scan + 3) - now
+            deadline = event_handler.next_deadline()
+            if deadline is not None:
+                timeout = min(timeout, deadline - now)
+            if batch_manager and batch_manager.next_ready_at is not None:
+                timeout = min(
+                    timeout, batch_manager.next_ready_at - time.monotonic()
+                )
+            event_handler.wait_for_work(max(timeout, 0.05))
     except KeyboardInterrupt:
         observer.stop()
 